@@ -0,0 +1,95 @@
+import os
+import json
+import shutil
+from .MotifModule import Motif
+from .FileModule import SimpanJson
+from .ImageInfoModule import UkuranGambar
+from .zipModule import ZIP
+
+# Aset turunan satu motif tersimpan (MotifForm1): grid lidi, penggaris, grid motif, garis merah,
+# tabel sprite slice dan zip unduhan. Semua dibuat sekali (di background setelah PostImage),
+# setiap file ditulis atomik (tmp + rename), lalu dicatat di manifest
+# {imgAfter}_aset.json. View detail cukup membaca manifest.
+
+VERSI = 1
+
+class AsetMotif:
+    def __init__(self, imgBefore, imgAfter):
+        self.imgBefore = str(imgBefore)
+        self.imgAfter = str(imgAfter)
+        self.manifest = f"{self.imgAfter[1:-4]}_aset.json"
+
+    def baca(self):
+        # None jika manifest belum ada, versinya lama, atau ada aset yang hilang
+        try:
+            with open(self.manifest) as f:
+                aset = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        if aset.get("versi") != VERSI or not all(os.path.exists(path) for path in aset["file"]):
+            return None
+        return aset
+
+    def buat(self):
+        Asal = Motif(self.imgBefore)
+        Lidi = Asal.GridLidi()
+        Help = Asal.GridHelp()
+
+        Hasil = Motif(self.imgAfter).GridMotif()
+        RedLine = Motif(Hasil).redLine()
+
+        Zipfile = ZIP(self.imgAfter, self.imgBefore).ZIPFile()
+
+        SpriteLidi = Motif(Lidi).SliceSprite()
+        SpriteMotif = Motif(RedLine).SliceSprite()
+
+        aset = {
+            "versi": VERSI,
+            "lidi": Lidi,
+            "help": Help,
+            "motif": Hasil,
+            "red": RedLine,
+            "zip": Zipfile,
+            "spriteLidi": SpriteLidi,
+            "spriteMotif": SpriteMotif,
+            "file": [Lidi, Help, Hasil, RedLine, Zipfile, f"{Lidi[:-4]}_slice.json", f"{RedLine[:-4]}_slice.json"],
+        }
+
+        SimpanJson(aset, self.manifest)
+
+        return aset
+
+    def siapkan(self):
+        # motif lama (sebelum ada precompute) dibuat sekali saat pertama dibuka
+        return self.baca() or self.buat()
+
+    def hapus(self):
+        # hapus gambar asli, semua aset turunan dan manifest; file yang tidak ada dilewati
+        lidi = self.imgBefore[1:-4]
+        motif = self.imgAfter[1:-4]
+        files = [
+            self.imgBefore[1:], f"{lidi}_grid.jpg", f"{lidi}_grid_help.jpg", f"{lidi}_grid_slice.json",
+            self.imgAfter[1:], f"{motif}_grid.png", f"{motif}_grid_red.jpg", f"{motif}_grid_red_slice.json",
+            f"{motif}.zip", self.manifest,
+        ]
+        for path in files:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+
+        # direktori slice per stripe dari versi sebelum sprite sheet
+        shutil.rmtree(f"{lidi}_grid", ignore_errors=True)
+        shutil.rmtree(f"{motif}_grid_red", ignore_errors=True)
+
+def ParseUrutan(urutanLidi):
+    # "1, 2, 3" (atau "[1, 2, 3]") menjadi [1, 2, 3]
+    return [int(x) for x in str(urutanLidi).strip("[]").split(",") if x.strip()]
+
+def LengkapiMotif(motif):
+    # motif yang disimpan sebelum ada metadata terstruktur diisi sekali saat pertama dibuka
+    motif.urutan = ParseUrutan(motif.urutanLidi)
+    motif.tinggiLidi, motif.lebarLidi = UkuranGambar(motif.imgBefore[1:])
+    motif.aset = AsetMotif(motif.imgBefore, motif.imgAfter).siapkan()
+    motif.save(update_fields=["urutan", "tinggiLidi", "lebarLidi", "aset"])
+    return motif
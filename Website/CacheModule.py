@@ -0,0 +1,77 @@
+import hashlib
+import threading
+import numpy as np
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import cache
+
+def HashLidi(lidi):
+    # hash dari piksel hasil decode, upload ulang dengan nama file berbeda tetap sama
+    lidi = np.ascontiguousarray(lidi)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(lidi.shape).encode())
+    h.update(lidi.tobytes())
+    return h.hexdigest()
+
+def UkuranEntry(entry):
+    # jumlah byte semua array di dalam entry, termasuk dict bersarang (baris packed)
+    if isinstance(entry, np.ndarray):
+        return entry.nbytes
+    if isinstance(entry, dict):
+        return sum(UkuranEntry(v) for v in entry.values())
+    return 0
+
+class LidiCache:
+    # cache LRU hasil preprocessing lidi (baris biner, matrix skor, dimensi gambar)
+    def __init__(self, maxItem=256, maxBytes=64 * 1024 * 1024):
+        self.maxItem = maxItem
+        self.maxBytes = maxBytes
+        self.data = OrderedDict()
+        self.ukuran = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.data.get(key)
+            if entry is not None:
+                self.data.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        size = UkuranEntry(entry)
+        if size > self.maxBytes:
+            return
+
+        with self.lock:
+            if key in self.data:
+                self.ukuran -= self.data.pop(key)["size"]
+
+            entry = dict(entry, size=size)
+            self.data[key] = entry
+            self.ukuran += size
+
+            # buang entry yang paling lama tidak dipakai sampai di bawah batas
+            while len(self.data) > self.maxItem or self.ukuran > self.maxBytes:
+                _, lama = self.data.popitem(last=False)
+                self.ukuran -= lama["size"]
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+            self.ukuran = 0
+
+lidiCache = LidiCache()
+
+# Cache hasil generate: (hash lidi, jmlBaris, Baris, mode, seed, jmlVarian) -> urutan dan
+# path gambar setiap varian.
+# Disimpan di cache Django (file based) sehingga dipakai bersama oleh semua proses.
+
+def KeyHasil(hashLidi, jmlBaris, Baris, mode, seed, jmlVarian=1):
+    return f"motif:{hashLidi}:{int(jmlBaris)}:{int(Baris)}:{int(mode)}:{int(seed)}:{int(jmlVarian)}"
+
+def GetHasil(key):
+    return cache.get(key)
+
+def SetHasil(key, kandidat, paths):
+    kandidat = [[int(x) for x in urutan] for urutan in kandidat]
+    cache.set(key, {"urutan": kandidat, "path": list(paths)}, timeout=settings.MOTIF_RESULT_TIMEOUT)
@@ -1,4 +1,4 @@
-import cv2
+from .ImageInfoModule import UkuranGambar
 class Check:
     def __init__(self, fullpath, jmlBaris):
         self.fullpath = fullpath
@@ -22,8 +22,7 @@ class Check:
     
     def checkSpecImage1(self):
 
-        img = cv2.imread(str(self.fullpath),1)
-        height, width, channels = img.shape
+        height, width = UkuranGambar(self.fullpath)
 
         if(6<= height <=12):
             return "1", height
@@ -32,8 +31,7 @@ class Check:
 
     def checkSpecImage2(self):
         
-        img = cv2.imread(str(self.fullpath),1)
-        height, width, channels = img.shape
+        height, width = UkuranGambar(self.fullpath)
 
         if(2<= width <= 140):
             return "1", width
@@ -1,250 +1,367 @@
-import cv2
 import os
+import time
 import uuid
-import pants
+import shutil
+import secrets
 import numpy as np
-from PIL import Image
-from itertools import permutations
 from .Function import TabuSearch
 from .Function import RandomSearch
 from .Function import GreedySearch
 from .Function import ACO
-from .Function import SkorPertama
-from .ProcessImage import ScaleImage
-from .ProcessImage import ProcesImage
-from .ProcessImage import SeparateImage
-from .ProcessImage import ConvertRGB
-from .ProcessImage import ConvertArrayImage
+from .Function import DynamicProgramming
+from .Function import BeamSearch
+from .Function import PackLidi
+from .Function import SkorBlok
+from .Function import KelasBaris
+from .Function import BarisKelas
+from .Function import IndeksTetangga
+from .ProcessImage import ScaleArray
+from .ProcessImage import SaveImage
+from .ProcessImage import ProcesImageArray
+from .ProcessImage import ReadLidi
+from .ProcessImage import ConvertBinaryArray
 from .ProcessImage import ConvertLiditoArray
 from .ProcessImage import CreateImage
+from .ProcessImage import MirrorIndex
+from .CacheModule import HashLidi
+from .CacheModule import lidiCache
+from .CacheModule import KeyHasil
+from .CacheModule import GetHasil
+from .CacheModule import SetHasil
+from .LibraryModule import LidiLibrary
+from .LibraryModule import SkorPustaka
+
+def CleanWorkspace(folderUser, umur=86400):
+    # hapus workspace generate milik user yang tidak pernah disimpan dan sudah lama
+    folder = f"media/{folderUser}"
+    if(not os.path.isdir(folder)):
+        return
+    batas = time.time() - umur
+    for nama in os.listdir(folder):
+        path = os.path.join(folder, nama)
+        try:
+            if os.path.getmtime(path) >= batas:
+                continue
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                os.remove(path)
+        except FileNotFoundError:
+            continue
 
 class CreateImageMotif:
-    def __init__(self, fullpath, namaMotif, jmlBaris, Baris, mode, username):
+    def __init__(self, fullpath, namaMotif, jmlBaris, Baris, mode, username, compressLevel=6, webp=False, seed=None, batasWaktu=None, pustaka=None, topK=32, batasSparse=512, cacheHasil=True):
         self.fullpath = fullpath
         self.namaMotif = namaMotif
         self.jmlBaris = jmlBaris
         self.Baris = Baris
         self.mode = mode
         self.username = username
-    
-    def imageEven(self):
-        def SkorACO(a, b):
-            temp1 = Array_data[a[0]]
-            temp2 = Array_data[a[1]]
-            temp3 = Array_data[b[0]]
-            temp4 = Array_data[b[1]]
-
-            SkorArray1 = SkorPertama(temp1, temp2)
-            SkorArray2 = SkorPertama(temp3, temp4)
-            SkorArray3 = SkorPertama(temp2, temp3)
-
-            SkorArray = 1/(1 + SkorArray1 + SkorArray2 + SkorArray3)
-            return SkorArray
-        
-        image_fullpath = self.fullpath
-        image_name = self.namaMotif
-        
+        self.compressLevel = compressLevel
+        self.webp = webp
+        self.workspace = uuid.uuid4().hex
+
+        # seed generate, seed yang sama menghasilkan varian yang sama
+        self.seed = secrets.randbelow(2**31) if seed is None else int(seed)
+
+        # cacheHasil=False selalu menjalankan search (mis. benchmark)
+        self.cacheHasil = cacheHasil
+
+        # batas waktu search (detik) untuk seluruh batch; None berarti
+        # setiap mode memakai batas bawaannya sendiri
+        self.batasWaktu = batasWaktu
+        self.statistik = []
+
+        # pustaka: (root, scope) pustaka lidi; jika diisi, baris dari semua lidi di pustaka
+        # dengan lebar yang sama ikut menjadi kandidat dan rawUrl berisi gambar lidi gabungan
+        self.pustaka = pustaka
+        self.rawUrl = None
+        self.offset = 0
+
+        # jika jumlah kelas baris melebihi batasSparse, Greedy, ACO dan Beam hanya
+        # mempertimbangkan topK penerus terbaik tiap baris (lihat indeksTetangga)
+        self.topK = topK
+        self.batasSparse = batasSparse
+        self.tetangga = None
+
+        # hasil preprocessing, diisi sekali oleh prepare()
+        self.hash = None
+        self.rows = None
+        self.Skor = None
+        self.kelas = None
+        self.jmlAnggota = None
+
+        # waktu per tahap (detik): decode, binarize, score, search, assemble, encode
+        self.waktu = {}
+
+    def catatWaktu(self, tahap, mulai):
+        sekarang = time.perf_counter()
+        self.waktu[tahap] = self.waktu.get(tahap, 0.0) + sekarang - mulai
+        return sekarang
+
+    def prepare(self):
+        if self.Skor is None:
+            mulai = time.perf_counter()
+
+            # Decode satu kali, setiap baris lidi hanya berupa view dari array ini
+            lidi = ReadLidi(self.fullpath)
+            self.rows = ConvertLiditoArray(lidi)
+
+            # lidi yang sama (berdasarkan hash piksel) langsung memakai hasil sebelumnya
+            self.hash = HashLidi(lidi)
+            if self.pustaka is not None:
+                return self.preparePustaka(lidi, self.catatWaktu("decode", mulai))
+            cache = lidiCache.get(self.hash)
+            mulai = self.catatWaktu("decode", mulai)
+            if cache is not None:
+                self.kelas = cache["kelas"]
+                self.jmlAnggota = np.bincount(self.kelas)
+                self.Skor = cache["Skor"]
+                return self.Skor
+
+            # Convert Binary, baris biner yang identik menjadi satu kelas
+            Array_data = ConvertBinaryArray(lidi)
+            Array_unik, self.kelas = KelasBaris(Array_data)
+            self.jmlAnggota = np.bincount(self.kelas)
+            mulai = self.catatWaktu("binarize", mulai)
+
+            # Skor semua pasangan kelas dihitung sekali dari baris yang sudah dipack,
+            # dipakai oleh semua mode
+            packed = PackLidi(Array_unik)
+            self.Skor = SkorBlok(packed, packed)
+            mulai = self.catatWaktu("score", mulai)
+
+            height, width, channels = lidi.shape
+            lidiCache.set(self.hash, {
+                "packed": packed,
+                "kelas": self.kelas,
+                "Skor": self.Skor,
+                "height": height,
+                "width": width,
+            })
+
+        return self.Skor
+
+    def preparePustaka(self, lidi, mulai):
+        # lidi ditambahkan ke pustaka (skor hanya dihitung untuk blok baris barunya),
+        # lalu search memakai semua baris pustaka
+        root, scope = self.pustaka
+        Array_data = ConvertBinaryArray(lidi)
+        mulai = self.catatWaktu("binarize", mulai)
+
+        pustaka = LidiLibrary(root, scope, lidi.shape[1])
+        self.offset, jumlah = pustaka.tambah(self.hash, self.rows, Array_data)
+        self.rows = pustaka.rows()
+
+        # baris packed identik == baris biner identik, digabung seperti KelasBaris biasa
+        _, self.kelas = KelasBaris(pustaka.hitam())
+        self.jmlAnggota = np.bincount(self.kelas)
+        wakil = np.unique(self.kelas, return_index=True)[1]
+        # kelas sedikit: matrix dimuat sekali; kelas banyak: tetap di memmap, Greedy, ACO
+        # dan Beam membaca blok baris (indeks top-k) dan elemen urutan saja
+        Skor = SkorPustaka(pustaka.skor(), wakil)
+        self.Skor = Skor.padat() if len(Skor) <= self.batasSparse else Skor
+        self.catatWaktu("score", mulai)
+
+        return self.Skor
+
+    def indeksTetangga(self):
+        # indeks top-k penerus dibuat sekali per batch, hanya untuk kelas baris yang banyak
+        Skor = self.prepare()
+        if self.topK is None or len(Skor) <= self.batasSparse:
+            return None
+        if self.tetangga is None:
+            mulai = time.perf_counter()
+            self.tetangga = IndeksTetangga(Skor, self.topK, self.jmlAnggota)
+            self.catatWaktu("index", mulai)
+        return self.tetangga
+
+    def dataPustaka(self):
+        # (hash, baris RGB, baris biner) untuk LidiLibrary.tambah dari hasil decode prepare()
+        self.prepare()
+        rows = np.ascontiguousarray(self.rows)
+        return self.hash, rows, ConvertBinaryArray(rows)
+
+    def imageEven(self, mode=None, seed=None, batasWaktu=None):
         jmlBaris = int(self.jmlBaris)
         jmlBaris = int(jmlBaris/2)
-        
-        Baris = int(self.Baris)
 
-        ModeGenerate = self.mode
-        folderUser = self.username
-        makeFolder = f"media/{folderUser}"
-
-        if(not os.path.exists(makeFolder)):
-            os.mkdir(makeFolder)
-        
-        ModeGenerate = int(ModeGenerate)
-
-        unique_file_name = uuid.uuid4().hex
-        unique = f"{folderUser}/{unique_file_name}.png"
-        image_save_path = image_fullpath.replace(image_name, unique)
-
-        namaDirektori = f"Image/{folderUser}"
-        Direktori = str(namaDirektori)
-
-        if(not os.path.exists(Direktori)):
-            os.mkdir(Direktori)
-
-        #Separate Image
-        img = cv2.imread(str(image_fullpath), 1)
-        SeparateImage(img, Direktori)
-
-        height, width, channels = img.shape
-
-        img = []
-        Lidi = []
+        a = self.generate(jmlBaris, mode, seed, batasWaktu)
 
-        # Conver to RGBA
-        img, Lidi = ConvertRGB(img, Lidi, height, Direktori)
+        return self.saveMotif(MirrorIndex(a, 2*jmlBaris), self.rows)
 
-        # Convert Binary
-        Array_data = []
-        Tabu_List = []
-
-        Array_data = ConvertArrayImage(img, Array_data)
-
-        comb = list(permutations(Lidi, 2))
-
-        SkorArray = []
-        for i in range(0, int(len(Lidi))):
-            for j in range(0, int(len(Lidi)-1)):
-                temp1 = Array_data[i].copy()
-                temp2 = Array_data[j].copy()
-
-                SkorArray.append(SkorPertama(temp1, temp2))
-        
-        #ACO
-        world = pants.World(comb, SkorACO)
-        solver = pants.Solver()
+    def imageOdd(self, mode=None, seed=None, batasWaktu=None):
+        jmlBaris = int(self.jmlBaris)+1
+        jmlBaris = int(jmlBaris/2)
 
-        comb = np.array_split(comb, height)
-        PanjangLidi = int(len(Lidi))-1
+        a = self.generate(jmlBaris, mode, seed, batasWaktu)
+
+        return self.saveMotif(MirrorIndex(a, 2*jmlBaris-1), self.rows)
+
+    def imageBatch(self, jmlVarian, mode=None, seed=None, progress=None):
+        # K varian motif dari satu kali preprocessing dan satu kali search: kandidat top-K
+        # yang saling berbeda. Hasil (url, urutanLidi, seed) per varian.
+        mode = self.mode if mode is None else mode
+        seed = self.seed if seed is None else int(seed)
+
+        self.prepare()
+        key = KeyHasil(self.hash, self.jmlBaris, self.Baris, mode, seed, jmlVarian)
+
+        # lidi, jmlBaris, mode dan seed yang sama memakai cache hasil; hasil dari pustaka
+        # tidak dicache karena isi pustaka terus bertambah
+        pakaiCache = self.cacheHasil and self.pustaka is None
+        cache = GetHasil(key) if pakaiCache else None
+        if cache is not None:
+            kandidat, paths = cache["urutan"], cache["path"]
+        else:
+            kandidat = self.kandidatMotif(mode, seed, jmlVarian)
+            if self.pustaka is not None:
+                kandidat = self.lidiGabungan(kandidat)
+            paths = [None] * len(kandidat)
+
+        hasil = []
+        for a, path in zip(kandidat, paths):
+            salinan = None if path is None else self.copyMotif(path, a)
+            if salinan is None:
+                salinan = self.saveMotif(a, self.rows)
+            hasil.append(salinan + (seed,))
+
+            if progress is not None:
+                progress(len(hasil), jmlVarian)
+
+        if pakaiCache:
+            SetHasil(key, kandidat, [self.pathMotif(url) for url, b, s in hasil])
+
+        return hasil
+
+    def lidiGabungan(self, kandidat):
+        # baris pustaka yang dipakai semua kandidat disusun menjadi satu gambar lidi,
+        # urutanLidi setiap kandidat kemudian mengacu ke baris gambar lidi ini
+        dipakai, urutan = np.unique(np.array(kandidat), return_inverse=True)
+        self.rows = np.ascontiguousarray(self.rows[dipakai])
+
+        self.rawUrl = f"/media/{self.username}/{self.workspace}/lidi_{uuid.uuid4().hex}.png"
+        path = self.pathMotif(self.rawUrl)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        SaveImage(self.rows, path, self.compressLevel)
+
+        return urutan.reshape(len(kandidat), -1).tolist()
+
+    def kandidatMotif(self, mode, seed, jmlVarian):
+        # urutan lengkap (sudah dicerminkan) dari jmlVarian kandidat terbaik satu search
+        if int(self.jmlBaris) % 2 == 0:
+            jmlBaris = int(int(self.jmlBaris)/2)
+            panjang = 2*jmlBaris
+        else:
+            jmlBaris = int((int(self.jmlBaris)+1)/2)
+            panjang = 2*jmlBaris-1
+
+        hasil = self.search(jmlBaris, mode, seed, self.batasWaktu, jmlVarian)
+        baris = self.offset + int(self.Baris)
+        kandidat = [[int(x) for x in MirrorIndex(BarisKelas(a, self.kelas, baris), panjang)] for a in hasil.kandidat]
+
+        # lidi dengan sedikit baris bisa punya urutan berbeda kurang dari jmlVarian
+        while len(kandidat) < jmlVarian:
+            kandidat.append(kandidat[len(kandidat) % len(hasil.kandidat)])
+
+        return kandidat
+
+    def generate(self, jmlBaris, mode=None, seed=None, batasWaktu=None):
+        return BarisKelas(self.search(jmlBaris, mode, seed, batasWaktu).urutan, self.kelas, self.offset + int(self.Baris))
+
+    def search(self, jmlBaris, mode=None, seed=None, batasWaktu=None, jmlKandidat=1):
+        # search berjalan di atas kelas baris, hasilnya dikembalikan ke index baris oleh BarisKelas
+        Skor = self.prepare()
+        Baris = int(self.kelas[self.offset + int(self.Baris)])
+        ModeGenerate = int(self.mode if mode is None else mode)
+        # Greedy, ACO dan Beam memakai indeks top-k penerus untuk kelas baris yang banyak
+        tetangga = {"tetangga": self.indeksTetangga() if ModeGenerate in (2, 4, 6) else None}
+        # mode lain (dan tanpa indeks) butuh matrix skor penuh di memori
+        if tetangga["tetangga"] is None and isinstance(Skor, SkorPustaka):
+            Skor = Skor.padat()
+        mulai = time.perf_counter()
+
+        # semua mode anytime: urutan terbaik sampai batasWaktu habis,
+        # ditambah kandidat lain yang saling berbeda jika jmlKandidat > 1
+        opsi = {"jmlKandidat": jmlKandidat}
+        if batasWaktu is not None:
+            opsi["batasWaktu"] = batasWaktu
+
+        # kelas berisi beberapa baris identik boleh berurutan (anggotanya berbeda)
+        anggota = {"jmlAnggota": self.jmlAnggota}
 
         if(ModeGenerate == 1):
-            Tabu_List, Best_Solution = TabuSearch(PanjangLidi, Array_data, Baris, jmlBaris, Tabu_List)
-            a = Best_Solution[0]
+            hasil = TabuSearch(Skor, Baris, jmlBaris, seed=seed, **opsi, **anggota)
         elif(ModeGenerate == 2):
-            a = GreedySearch(PanjangLidi, comb, Baris, jmlBaris)
+            hasil = GreedySearch(Skor, Baris, jmlBaris, seed=seed, **opsi, **anggota, **tetangga)
         elif(ModeGenerate == 3):
-            a = RandomSearch(PanjangLidi, jmlBaris)
+            hasil = RandomSearch(Skor, jmlBaris, seed=seed, **opsi)
         elif(ModeGenerate == 4):
-            a = ACO(solver, world, jmlBaris)
-        
-        img = cv2.imread(str(image_fullpath), 1)
-
-        height, width, channels = img.shape
-        img = []
-
-        img = ConvertLiditoArray(img, height, Direktori)
-
-        c = a.copy()
-        c = c[::-1]
-        a.extend(c)
-        b = a.copy()
-        b = [x+1 for x in b]
-
-        img = CreateImage(a, img)
-        Image.fromarray(img).save(f"{namaDirektori}/Hasil1.jpg")
-        
-        img = Image.open(f"{namaDirektori}/Hasil1.jpg")
-        img = ProcesImage(img)
-        img = ScaleImage(img)
-        img.save(image_save_path)
-
-        return f"/media/{folderUser}/{unique_file_name}.png", b
-        
-    def imageOdd(self):
-        def SkorACO(a, b):
-            temp1 = Array_data[a[0]]
-            temp2 = Array_data[a[1]]
-            temp3 = Array_data[b[0]]
-            temp4 = Array_data[b[1]]
-
-            SkorArray1 = SkorPertama(temp1, temp2)
-            SkorArray2 = SkorPertama(temp3, temp4)
-            SkorArray3 = SkorPertama(temp2, temp3)
-
-            SkorArray = 1/(1 + SkorArray1 + SkorArray2 + SkorArray3)
-            return SkorArray
-        
-        image_fullpath = self.fullpath
-        image_name = self.namaMotif
-        
-        jmlBaris = int(self.jmlBaris)+1
-        jmlBaris = int(jmlBaris/2)
-        
-        Baris = int(self.Baris)
-
-        ModeGenerate = self.mode
+            hasil = ACO(Skor, jmlBaris, seed=seed, **opsi, **anggota, **tetangga)
+        elif(ModeGenerate == 5):
+            hasil = DynamicProgramming(Skor, jmlBaris, **opsi, **anggota)
+        elif(ModeGenerate == 6):
+            hasil = BeamSearch(Skor, jmlBaris, **opsi, **anggota, **tetangga)
+
+        self.catatWaktu("search", mulai)
+        self.statistik.append({
+            "mode": ModeGenerate,
+            "seed": seed,
+            "skor": hasil.skor,
+            "iterasi": hasil.iterasi,
+            "waktu": hasil.waktu,
+            "habisWaktu": hasil.habisWaktu,
+            "kandidat": len(hasil.kandidat),
+            "kelas": len(Skor),
+            "topK": None if tetangga["tetangga"] is None else self.topK,
+        })
+
+        return hasil
+
+    def saveMotif(self, a, rows):
         folderUser = self.username
-        makeFolder = f"media/{folderUser}"
-
-        if(not os.path.exists(makeFolder)):
-            os.mkdir(makeFolder)
-        
-        ModeGenerate = int(ModeGenerate)
 
+        # setiap generate punya workspace sendiri: media/{user}/{workspace}/
         unique_file_name = uuid.uuid4().hex
-        unique = f"{folderUser}/{unique_file_name}.png"
-        image_save_path = image_fullpath.replace(image_name, unique)
-
-        namaDirektori = f"Image/{folderUser}"
-        Direktori = str(namaDirektori)
-
-        if(not os.path.exists(Direktori)):
-            os.mkdir(Direktori)
-
-        #Separate Image
-        img = cv2.imread(str(image_fullpath), 1)
-        SeparateImage(img, Direktori)
-
-        height, width, channels = img.shape
-
-        img = []
-        Lidi = []
-
-        # Conver to RGBA
-        img, Lidi = ConvertRGB(img, Lidi, height, Direktori)
-
-        # Convert Binary
-        Array_data = []
-        Tabu_List = []
-
-        Array_data = ConvertArrayImage(img, Array_data)
+        unique = f"{folderUser}/{self.workspace}/{unique_file_name}.png"
+        image_save_path = self.fullpath.replace(self.namaMotif, unique)
 
-        comb = list(permutations(Lidi, 2))
+        os.makedirs(os.path.dirname(image_save_path), exist_ok=True)
 
-        SkorArray = []
-        for i in range(0, int(len(Lidi))):
-            for j in range(0, int(len(Lidi)-1)):
-                temp1 = Array_data[i].copy()
-                temp2 = Array_data[j].copy()
+        b = [int(x)+1 for x in a]
 
-                SkorArray.append(SkorPertama(temp1, temp2))
-        
-        #ACO
-        world = pants.World(comb, SkorACO)
-        solver = pants.Solver()
+        mulai = time.perf_counter()
+        img = CreateImage(a, rows)
+        img = ProcesImageArray(img)
+        mulai = self.catatWaktu("assemble", mulai)
 
-        comb = np.array_split(comb, height)
-        PanjangLidi = int(len(Lidi))-1
+        img = ScaleArray(img)
+        SaveImage(img, image_save_path, self.compressLevel, self.webp)
+        self.catatWaktu("encode", mulai)
 
-        if(ModeGenerate == 1):
-            Tabu_List, Best_Solution = TabuSearch(PanjangLidi, Array_data, Baris, jmlBaris, Tabu_List)
-            a = Best_Solution[0]
-        elif(ModeGenerate == 2):
-            a = GreedySearch(PanjangLidi, comb, Baris, jmlBaris)
-        elif(ModeGenerate == 3):
-            a = RandomSearch(PanjangLidi, jmlBaris)
-        elif(ModeGenerate == 4):
-            a = ACO(solver, world, jmlBaris)
-        
-        img = cv2.imread(str(image_fullpath), 1)
-
-        height, width, channels = img.shape
-        img = []
+        return f"/media/{folderUser}/{self.workspace}/{unique_file_name}.png", b
 
-        img = ConvertLiditoArray(img, height, Direktori)
+    def pathMotif(self, url):
+        # url /media/{user}/{workspace}/{file}.png -> path file di folder media
+        return self.fullpath.replace(self.namaMotif, url[len("/media/"):])
 
-        temp = a.pop()
-        c = a.copy()
-        c = c[::-1]
-
-        a.append(temp)
-        a.extend(c)
-        b = a.copy()
-        b = [x+1 for x in b]
-
-        img = CreateImage(a, img)
-        Image.fromarray(img).save(f"{namaDirektori}/Hasil1.jpg")
-        
-        img = Image.open(f"{namaDirektori}/Hasil1.jpg")
-        img = ProcesImage(img)
-        img = ScaleImage(img)
-        img.save(image_save_path)
-
-        return f"/media/{folderUser}/{unique_file_name}.png", b
+    def copyMotif(self, path, a):
+        # gambar hasil cache disalin ke workspace ini, workspace lain tetap milik pemiliknya
+        webpPath = os.path.splitext(path)[0] + ".webp"
+        if(not os.path.exists(path) or (self.webp and not os.path.exists(webpPath))):
+            return None
 
+        unique_file_name = uuid.uuid4().hex
+        url = f"/media/{self.username}/{self.workspace}/{unique_file_name}.png"
+        image_save_path = self.pathMotif(url)
+
+        os.makedirs(os.path.dirname(image_save_path), exist_ok=True)
+        try:
+            shutil.copyfile(path, image_save_path)
+            if self.webp:
+                shutil.copyfile(webpPath, os.path.splitext(image_save_path)[0] + ".webp")
+        except FileNotFoundError:
+            # workspace sumber terhapus (disimpan atau dibersihkan) saat sedang disalin
+            return None
+
+        return url, [int(x)+1 for x in a]
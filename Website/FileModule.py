@@ -0,0 +1,23 @@
+import os
+import json
+import uuid
+from contextlib import contextmanager
+
+# Penulisan file atomik: isi ditulis ke file sementara di folder yang sama lalu di-rename
+# (os.replace), sehingga pembaca lain hanya pernah melihat file lama atau file yang lengkap.
+
+@contextmanager
+def TulisAtomik(path):
+    # yield path sementara; jika blok selesai tanpa error, file sementara menggantikan path
+    tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+def SimpanJson(data, path):
+    with TulisAtomik(path) as tmp:
+        with open(tmp, "w") as f:
+            json.dump(data, f)
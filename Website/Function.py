@@ -1,5 +1,7 @@
+import time
 import numpy as np
-from random import randint
+from collections import deque
+from dataclasses import dataclass, field
     
 def SkorPertama(arr1, arr2):
     skor = 0
@@ -83,106 +85,537 @@ def SkorTotal(arr1, arr2):
     return float(SkorTotal)
 
 
-def GreedySearch(Lidi,comb, Baris, jmlBaris):
+def DensityVector(data):
+    # run length tiap baris dari np.diff, run > 4 piksel dikurangi 4 lalu dijumlah
+    data = np.asarray(data)
+    n, w = data.shape
+
+    awal = np.ones((n, w), dtype=bool)
+    awal[:, 1:] = np.diff(data, axis=1) != 0
+
+    idx = np.flatnonzero(awal.ravel())
+    panjang = np.diff(np.append(idx, n * w))
+    baris = idx // w
+
+    skor3 = np.bincount(baris, weights=np.maximum(panjang - 4, 0), minlength=n)
+
+    return -skor3
+
+# Representasi ringkas baris lidi: piksel hitam dipack menjadi word uint64 (64 piksel
+# per word), suku SkorPertama dihitung dengan AND + popcount antar word
+
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+def Popcount(x):
+    # jumlah bit 1 tiap elemen uint64; numpy < 2.0 memakai tabel per byte
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(x)
+    return _POPCOUNT8[x.view(np.uint8)].reshape(x.shape + (8,)).sum(axis=-1, dtype=np.uint8)
+
+def PackBaris(bits):
+    # matrix boolean N x W -> matrix uint64 N x ceil(W/64)
+    b = np.packbits(np.asarray(bits, dtype=bool), axis=1)
+    sisa = (-b.shape[1]) % 8
+    if sisa:
+        b = np.pad(b, ((0, 0), (0, sisa)))
+    return np.ascontiguousarray(b).view(np.uint64)
+
+def PackLidi(Array_data):
+    # hitam: posisi sama, kiri/kanan: baris tanpa piksel terakhir/pertama (tetangga tergeser)
+    data = np.asarray(Array_data)
+    hitam = data == 2
+    return {
+        "hitam": PackBaris(hitam),
+        "kiri": PackBaris(hitam[:, :-1]),
+        "kanan": PackBaris(hitam[:, 1:]),
+        "putih": (data == 1).sum(axis=1),
+        "density": DensityVector(data),
+        "lebar": data.shape[1],
+    }
+
+def JumlahAnd(P, Q, blok=128):
+    # matrix len(P) x len(Q): jumlah bit yang sama-sama 1, dihitung per word dan per blok baris
+    hasil = np.zeros((len(P), len(Q)), dtype=np.uint16)
+    PT, QT = np.ascontiguousarray(P.T), np.ascontiguousarray(Q.T)
+    tmp = np.empty((min(blok, len(P)), len(Q)), dtype=np.uint64)
+    for i in range(0, len(P), blok):
+        h = hasil[i:i+blok]
+        t = tmp[:len(h)]
+        for w in range(P.shape[1]):
+            np.bitwise_and(PT[w, i:i+blok, None], QT[w][None, :], out=t)
+            h += Popcount(t)
+    return hasil
+
+def SkorBlok(kiri, kanan):
+    # Skor[i][j] == SkorTotal(baris i dari kiri, baris j dari kanan), keduanya hasil PackLidi
+    lebar = kiri["lebar"]
+
+    # SkorPertama: posisi sama bernilai 0.5, tetangga kiri/kanan bernilai 1
+    pertama = 0.5 * JumlahAnd(kiri["hitam"], kanan["hitam"])
+    pertama += JumlahAnd(kiri["kiri"], kanan["kanan"])
+    pertama += JumlahAnd(kiri["kanan"], kanan["kiri"])
+
+    # SkorRasio: perbandingan piksel putih dan hitam dari kedua baris
+    rasio1 = kiri["putih"][:, None] + kanan["putih"][None, :]
+    rasio2 = 2 * lebar - rasio1
+    rasio = np.minimum(rasio1, rasio2) / np.maximum(rasio1, rasio2)
+
+    Skor = pertama * rasio + kiri["density"][:, None] + kanan["density"][None, :]
+    Skor = np.round(np.maximum(Skor, 0), 1)
+
+    return Skor
+
+def SkorMatrix(Array_data):
+    # matrix N x N, Skor[i][j] == SkorTotal(Array_data[i], Array_data[j])
+    packed = PackLidi(Array_data)
+    return SkorBlok(packed, packed)
+
+def KelasBaris(Array_data):
+    # baris biner yang identik digabung menjadi satu kelas, nomor kelas urut kemunculan pertama
+    data = np.asarray(Array_data)
+    _, wakil, kelas = np.unique(data, axis=0, return_index=True, return_inverse=True)
+
+    urut = np.argsort(wakil)
+    nomor = np.empty_like(urut)
+    nomor[urut] = np.arange(len(urut))
+
+    return data[wakil[urut]], nomor[kelas.reshape(-1)]
+
+def BarisKelas(urutan, kelas, baris=None):
+    # urutan kelas -> index baris; kelas yang sama berurutan memakai anggota bergantian.
+    # baris: baris awal pilihan user, anggota kelasnya diputar agar posisi 0 tepat baris itu
+    urutan = np.asarray(urutan)
+    kelas = np.asarray(kelas)
+    anggota = np.argsort(kelas, kind="stable")
+    jml = np.bincount(kelas)
+    awal = np.cumsum(jml) - jml
+    geser = np.zeros_like(jml)
+    if baris is not None:
+        geser[kelas[baris]] = np.flatnonzero(anggota == baris)[0] - awal[kelas[baris]]
+    t = np.arange(urutan.shape[-1])
+
+    return anggota[awal[urutan] + (t + geser[urutan]) % jml[urutan]]
+
+
+# Semua mode search bersifat anytime: batasWaktu (detik, None = tanpa batas) dicek
+# setiap iterasi dan urutan terbaik sejauh ini dikembalikan saat waktu habis
+
+@dataclass
+class HasilSearch:
+    urutan: list
+    skor: float
+    iterasi: int
+    waktu: float
+    habisWaktu: bool = False
+    kandidat: list = field(default_factory=list)
+
+def HabisWaktu(mulai, batasWaktu):
+    return batasWaktu is not None and time.perf_counter() - mulai > batasWaktu
+
+def HasilAkhir(Skor, urutan, iterasi, mulai, habisWaktu, pool=None):
+    urutan = [int(x) for x in urutan]
+    kandidat = [urutan] if pool is None else pool.kandidat(Skor, urutan)
+    return HasilSearch(urutan, float(SkorUrutan(Skor, urutan)), int(iterasi), time.perf_counter() - mulai, habisWaktu, kandidat)
+
+def LanjutGreedy(Transisi, urutan, jmlBaris, tetangga=None):
+    # melengkapi urutan yang terpotong batas waktu dengan baris berskor maksimal
+    urutan = [int(x) for x in urutan]
+    while len(urutan) < jmlBaris:
+        if tetangga is None:
+            urutan.append(int(np.argmax(Transisi[urutan[-1]])))
+        else:
+            urutan.append(int(tetangga[0][urutan[-1], 0]))
+    return urutan
+
+def PilihBeragam(urutan, skor, jmlKandidat, jarakMin):
+    # urutan berskor tertinggi yang saling berjarak Hamming >= jarakMin; jika kurang dari
+    # jmlKandidat, sisa slot diisi urutan terbaik berikutnya yang sekadar berbeda
+    urutan = np.atleast_2d(urutan)
+    skor = np.asarray(skor, dtype=np.float64).ravel()
+
+    boleh = np.isfinite(skor)
+    urutan, skor = urutan[boleh], skor[boleh]
+    if len(skor) > 64 * jmlKandidat:
+        atas = np.argpartition(-skor, 64 * jmlKandidat - 1)[:64 * jmlKandidat]
+        urutan, skor = urutan[atas], skor[atas]
+    if len(skor) == 0:
+        return urutan, skor
+
+    urutan, idx = np.unique(urutan, axis=0, return_index=True)
+    skor = skor[idx]
+    urut = np.argsort(-skor, kind="stable")
+    urutan, skor = urutan[urut], skor[urut]
+
+    pilih = []
+    for batas in (jarakMin, 1):
+        for i in range(len(urutan)):
+            if len(pilih) >= jmlKandidat:
+                break
+            if i in pilih:
+                continue
+            if not pilih or (urutan[pilih] != urutan[i]).sum(axis=1).min() >= batas:
+                pilih.append(i)
+
+    pilih.sort()
+    return urutan[pilih], skor[pilih]
+
+class PoolKandidat:
+    # kandidat top-K yang saling berbeda, dikumpulkan selama satu kali search
+    def __init__(self, jmlKandidat=1, jarakMin=None):
+        self.jmlKandidat = int(jmlKandidat)
+        self.jarakMin = jarakMin
+        self.urutan = None
+        self.skor = None
+
+    def tambah(self, urutan, skor):
+        if self.jmlKandidat <= 1:
+            return
+        urutan = np.atleast_2d(urutan)
+        if self.jarakMin is None:
+            # bawaan: minimal seperempat posisi berbeda
+            self.jarakMin = max(1, urutan.shape[1] // 4)
+        if self.urutan is not None:
+            urutan = np.concatenate([self.urutan, urutan])
+            skor = np.concatenate([self.skor, np.atleast_1d(skor)])
+        self.urutan, self.skor = PilihBeragam(urutan, skor, self.jmlKandidat, self.jarakMin)
+
+    def kandidat(self, Skor, terbaik):
+        # urutan terbaik selalu menjadi kandidat pertama, sisanya diurutkan ulang dengan Skor
+        terbaik = np.asarray(terbaik)
+        if self.urutan is None:
+            return [[int(x) for x in terbaik]]
+
+        lain = self.urutan[(self.urutan != terbaik).any(axis=1)]
+        skor = np.append(np.finfo(np.float64).max, SkorUrutan(Skor, lain))
+        urutan, _ = PilihBeragam(np.vstack([terbaik, lain]), skor, self.jmlKandidat, self.jarakMin)
+
+        return [[int(x) for x in u] for u in urutan]
+
+def GreedySearch(Skor, Baris, jmlBaris, seed=None, batasWaktu=None, jmlKandidat=1, jarakMin=None, jmlAnggota=None, tetangga=None):
+    # multi-start: setiap baris lidi dicoba sebagai baris kedua (urutan acak) sampai waktu habis
+    mulai = time.perf_counter()
+    rng = np.random.default_rng(seed)
     jmlBaris = int(jmlBaris)
-    arr = list()
-    arr.append(Baris)
-    for i in range(0, jmlBaris-1):
-        # inisiasi baris awal
-        if(i == 0):
-            n = randint(0,Lidi)
-        
-        # memasukkan kedalam list baris lidi
-        arr.append(n)
-        
-        #temukan index maksimal skor ke semua baris lidi
-        maxIndex = np.argmax(comb[n])
-        
-        maxIndex = int(maxIndex/2)
-        
-        # ambil baris skor maksimal
-        
-        n = comb[n][maxIndex][1]
-    
-    return arr  
-    
-def RandomSearch(Lidi, jmlBaris):
-    arr = list()
-    jmlBaris -= 1
-    while(jmlBaris > 0):
-        
-        n = randint(0, Lidi)
-        arr.append(n)     
-        jmlBaris -= 1   
-    return arr
+    Transisi = SkorTransisi(Skor, jmlAnggota) if tetangga is None else None
+    # urutan dinilai dengan Transisi agar pasangan terlarang (-inf) tidak pernah terpilih
+    Nilai = Skor if Transisi is None else Transisi
+    Lidi = int(len(Skor))-1
+    # baris kedua sama dengan Baris hanya boleh jika kelasnya berisi lebih dari satu baris
+    ulangBaris = Lidi == 0 or (jmlAnggota is not None and jmlAnggota[Baris] > 1)
 
+    pool = PoolKandidat(jmlKandidat, jarakMin)
+    terbaik, skorTerbaik = None, -np.inf
+    semua = []
+    iterasi, habis = 0, False
+    for n in rng.permutation(Lidi+1):
+        if terbaik is not None and HabisWaktu(mulai, batasWaktu):
+            habis = True
+            break
 
+        n = int(n)
+        if n == Baris and not ulangBaris:
+            continue
 
-# Tabu Search with random generate lidi
+        # baris berikutnya selalu baris dengan skor maksimal selain baris itu sendiri
+        arr = LanjutGreedy(Transisi, [Baris, n], jmlBaris, tetangga) if jmlBaris > 1 else [Baris]
 
-def GenerateArray(Lidi, Array_data, Baris, jmlBaris):
-    ScorePass = 30
-    arr = list()
-    arr.append(Baris)
-    jmlBaris -= 1
-    while(jmlBaris > 0):
-        
-        n = randint(0, Lidi)
-        a = []
-        b = []
-        a = Array_data[Baris].copy()
-        b = Array_data[n].copy()
-        
-        while(SkorTotal(a, b)< ScorePass):
-            n = randint(0, Lidi)
-            b = Array_data[n].copy()
-        
-        arr.append(n)
-        
-        Baris = n
-            
-        jmlBaris -= 1
-        
-    return arr
+        skor = SkorUrutan(Nilai, arr)
+        if skor > skorTerbaik:
+            terbaik, skorTerbaik = arr, skor
+        semua.append(arr)
+        iterasi += 1
 
-def TabuSearch(Lidi, Array_data, Baris,jmlBaris, Tabu_List):
-    
-    Best_Solution = []
-    
-    array = GenerateArray(Lidi, Array_data, Baris, jmlBaris)
+    semua = np.array(semua)
+    pool.tambah(semua, SkorUrutan(Nilai, semua))
+
+    return HasilAkhir(Skor, terbaik, iterasi, mulai, habis, pool)
     
-    if(array not in Tabu_List):
-#         print(array)
-        Best_Solution.append(array)
-        # print(Best_Solution)
-        Tabu_List.append(array)
-    # else:
-        # print("Ada di Tabu")
-        
-    return [Tabu_List, Best_Solution]
+def RandomSearch(Skor, jmlBaris, seed=None, batasWaktu=None, maxIterasi=50, jmlSampel=64, jmlKandidat=1, jarakMin=None):
+    # random restart: urutan acak diambil per batch, yang terbaik disimpan sampai waktu habis
+    mulai = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    jmlBaris = int(jmlBaris)
+    Lidi = int(len(Skor))-1
 
-def ACO(solver, world, jmlBaris):
+    # urutan pertama sama dengan random search biasa
+    terbaik = rng.integers(0, Lidi+1, jmlBaris)
+    skorTerbaik = SkorUrutan(Skor, terbaik)
+    pool = PoolKandidat(jmlKandidat, jarakMin)
 
-    solution = solver.solve(world)
-    # or
-    solutions = solver.solutions(world)
+    iterasi, habis = 1, False
+    while iterasi < maxIterasi:
+        if HabisWaktu(mulai, batasWaktu):
+            habis = True
+            break
 
-    best = float("inf")
-    for solution in solutions:
-        assert solution.distance < best
-        best = solution.distance
-        path = solution.tour
-    
-    #convert array 2D to 1D
-    convert = np.array(path)
-    result = convert.flatten()
+        arr = rng.integers(0, Lidi+1, (jmlSampel, jmlBaris))
+        skor = SkorUrutan(Skor, arr)
+        pool.tambah(arr, skor)
+        pilih = int(np.argmax(skor))
+        if skor[pilih] > skorTerbaik:
+            terbaik, skorTerbaik = arr[pilih], skor[pilih]
+        iterasi += 1
+
+    return HasilAkhir(Skor, terbaik, iterasi, mulai, habis, pool)
+
+
+def SkorTransisi(Skor, jmlAnggota=None):
+    # baris yang sama tidak boleh berurutan, kecuali lidi hanya punya satu baris
+    # atau kelas baris (jmlAnggota) berisi lebih dari satu baris identik
+    Skor = np.array(Skor, dtype=np.float64)
+    if len(Skor) > 1:
+        diagonal = Skor.diagonal().copy()
+        np.fill_diagonal(Skor, -np.inf)
+        if jmlAnggota is not None:
+            np.fill_diagonal(Skor, np.where(np.asarray(jmlAnggota) > 1, diagonal, -np.inf))
+    return Skor
+
+def IndeksTetangga(Skor, k=32, jmlAnggota=None, blok=256):
+    # hanya k penerus terbaik tiap baris (urut menurun) dengan aturan diagonal SkorTransisi,
+    # dibangun per blok baris sehingga Skor boleh berupa memmap tanpa dimuat utuh
+    jmlLidi = int(len(Skor))
+    k = min(int(k), jmlLidi)
+    idx = np.empty((jmlLidi, k), dtype=np.int64)
+    nilai = np.empty((jmlLidi, k))
+    for i in range(0, jmlLidi, blok):
+        j = min(i + blok, jmlLidi)
+        b = np.array(Skor[i:j], dtype=np.float64)
+        if jmlLidi > 1:
+            dilarang = np.ones(j - i, dtype=bool) if jmlAnggota is None else np.asarray(jmlAnggota[i:j]) <= 1
+            baris = np.arange(j - i)[dilarang]
+            b[baris, baris + i] = -np.inf
+
+        top = np.argpartition(-b, k - 1, axis=1)[:, :k]
+        v = np.take_along_axis(b, top, axis=1)
+        urut = np.argsort(-v, axis=1, kind="stable")
+        idx[i:j] = np.take_along_axis(top, urut, axis=1)
+        nilai[i:j] = np.take_along_axis(v, urut, axis=1)
+    return idx, nilai
+
+def Penerus(Transisi, tetangga=None):
+    # (kolom, skor) calon baris berikutnya: indeks top-k jika ada, selain itu semua baris
+    if tetangga is not None:
+        return tetangga
+    return np.broadcast_to(np.arange(len(Transisi)), Transisi.shape), Transisi
+
+def SkorUrutan(Skor, urutan):
+    # jumlah skor pasangan baris yang bersebelahan, urutan boleh 1D atau 2D (batch)
+    urutan = np.asarray(urutan)
+    return Skor[urutan[..., :-1], urutan[..., 1:]].sum(axis=-1)
+
+
+# Tabu Search dengan neighbourhood ganti/swap/insert di atas matrix skor
+
+def TetanggaTabu(urutan, jmlLidi):
+    k = len(urutan)
+    posisi = np.arange(1, k)
+    tetangga = []
+
+    # ganti: baris pada posisi p diganti baris lain
+    p, r = np.meshgrid(posisi, np.arange(jmlLidi), indexing="ij")
+    p, r = p.ravel(), r.ravel()
+    ganti = np.tile(urutan, (len(p), 1))
+    ganti[np.arange(len(p)), p] = r
+    tetangga.append(ganti)
+
+    # swap: tukar baris pada posisi p dan q
+    p, q = np.triu_indices(k - 1, 1)
+    p, q = p + 1, q + 1
+    swap = np.tile(urutan, (len(p), 1))
+    swap[np.arange(len(p)), p] = urutan[q]
+    swap[np.arange(len(p)), q] = urutan[p]
+    tetangga.append(swap)
+
+    # insert: baris pada posisi p dipindah ke posisi q, baris di antaranya bergeser
+    p, q = np.meshgrid(posisi, posisi, indexing="ij")
+    p, q = p.ravel()[:, None], q.ravel()[:, None]
+    j = np.arange(k)[None, :]
+    idx = j + ((j >= p) & (j < q)) - ((j > q) & (j <= p))
+    idx = np.where(j == q, p, idx)
+    tetangga.append(urutan[idx])
+
+    tetangga = np.concatenate(tetangga)
+    berubah = (tetangga != urutan).any(axis=1)
+
+    return tetangga[berubah]
+
+def TabuSearch(Skor, Baris, jmlBaris, maxIterasi=200, batasWaktu=1.0, ukuranTabu=10, seed=None, jmlKandidat=1, jarakMin=None, jmlAnggota=None):
+    # waktu proses dibatasi oleh maxIterasi dan batasWaktu (detik)
+    mulai = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    jmlBaris = int(jmlBaris)
+    Asli, Skor = Skor, SkorTransisi(Skor, jmlAnggota)
+    jmlLidi = int(len(Skor))
+
+    # solusi awal: random walk tanpa baris berurutan yang sama
+    urutan = [Baris]
+    while len(urutan) < jmlBaris:
+        n = int(rng.integers(0, jmlLidi))
+        if jmlLidi == 1 or n != urutan[-1]:
+            urutan.append(n)
+    urutan = np.array(urutan)
+
+    if jmlBaris < 2:
+        return HasilAkhir(Asli, urutan, 0, mulai, False)
+
+    skorSekarang = SkorUrutan(Skor, urutan)
+    terbaik, skorTerbaik = urutan.copy(), skorSekarang
+    pool = PoolKandidat(jmlKandidat, jarakMin)
+
+    # Tabu List menyimpan pasangan (posisi, baris) yang baru dilepas
+    Tabu_List = deque(maxlen=ukuranTabu)
+
+    iterasi, habis = 0, False
+    while iterasi < maxIterasi:
+        if HabisWaktu(mulai, batasWaktu):
+            habis = True
+            break
+        iterasi += 1
+
+        tetangga = TetanggaTabu(urutan, jmlLidi)
+        if len(tetangga) == 0:
+            break
+        skor = SkorUrutan(Skor, tetangga)
+        pool.tambah(tetangga, skor)
+
+        tabu = np.zeros((jmlBaris, jmlLidi), dtype=bool)
+        for gerakan in Tabu_List:
+            for p, r in gerakan:
+                tabu[p, r] = True
+        berubah = tetangga != urutan
+        isTabu = (berubah & tabu[np.arange(jmlBaris), tetangga]).any(axis=1)
+
+        # aspirasi: gerakan tabu tetap boleh jika menghasilkan skor terbaik baru
+        boleh = ~isTabu | (skor > skorTerbaik)
+        if not boleh.any():
+            break
+
+        skor = np.where(boleh, skor, -np.inf)
+        pilih = int(np.argmax(skor))
+        if not np.isfinite(skor[pilih]):
+            break
+
+        posisi = np.flatnonzero(berubah[pilih])
+        Tabu_List.append([(int(p), int(urutan[p])) for p in posisi])
+
+        urutan, skorSekarang = tetangga[pilih], skor[pilih]
+        if skorSekarang > skorTerbaik:
+            terbaik, skorTerbaik = urutan.copy(), skorSekarang
+
+    return HasilAkhir(Asli, terbaik, iterasi, mulai, habis, pool)
+
+# Dynamic Programming (Viterbi) untuk urutan dengan skor total maksimal
+
+def DynamicProgramming(Skor, jmlBaris, batasWaktu=None, jmlKandidat=1, jarakMin=None, jmlAnggota=None):
+    # jika waktu habis, prefix terbaik yang sudah dihitung dilengkapi secara greedy
+    mulai = time.perf_counter()
+    jmlBaris = int(jmlBaris)
+    Transisi = SkorTransisi(Skor, jmlAnggota)
+    jmlLidi = int(len(Skor))
+
+    # nilai[j] = skor terbaik urutan sepanjang t yang berakhir di baris j
+    nilai = np.zeros(jmlLidi)
+    jejak = []
+    habis = False
+    for t in range(1, jmlBaris):
+        if HabisWaktu(mulai, batasWaktu):
+            habis = True
+            break
+        total = nilai[:, None] + Transisi
+        asal = np.argmax(total, axis=0)
+        nilai = total[asal, np.arange(jmlLidi)]
+        jejak.append(asal)
+
+    # backtrack dari semua baris akhir sekaligus: urutan terbaik per baris akhir
+    akhir = np.argsort(-nilai, kind="stable")
+    semua = [akhir]
+    for asal in reversed(jejak):
+        semua.append(asal[semua[-1]])
+    semua = np.column_stack(semua[::-1])
+    semua = np.array([LanjutGreedy(Transisi, u, jmlBaris) for u in semua])
+
+    pool = PoolKandidat(jmlKandidat, jarakMin)
+    pool.tambah(semua, SkorUrutan(Transisi, semua))
+
+    return HasilAkhir(Skor, semua[0], len(jejak), mulai, habis, pool)
+
+def BeamSearch(Skor, jmlBaris, lebarBeam=16, batasWaktu=None, jmlKandidat=1, jarakMin=None, jmlAnggota=None, tetangga=None):
+    # versi aproksimasi DP untuk lidi dengan baris sangat banyak
+    mulai = time.perf_counter()
+    jmlBaris = int(jmlBaris)
+    # beam diperlebar agar beam akhir cukup beragam untuk jmlKandidat kandidat
+    lebarBeam = max(lebarBeam, 16 * int(jmlKandidat))
+    Transisi = SkorTransisi(Skor, jmlAnggota) if tetangga is None else None
+    kolom, nilaiPenerus = Penerus(Transisi, tetangga)
+    jmlLidi, k = kolom.shape
+
+    beam = np.arange(jmlLidi)[:, None]
+    nilai = np.zeros(jmlLidi)
+    habis = False
+    for t in range(1, jmlBaris):
+        if HabisWaktu(mulai, batasWaktu):
+            habis = True
+            break
+        total = (nilai[:, None] + nilaiPenerus[beam[:, -1]]).ravel()
+        lebar = min(lebarBeam, int(np.isfinite(total).sum()) or 1)
+        pilih = np.argpartition(-total, lebar - 1)[:lebar]
+        asal, pos = np.divmod(pilih, k)
+        beam = np.column_stack([beam[asal], kolom[beam[asal, -1], pos]])
+        nilai = total[pilih]
+
+    # seluruh isi beam akhir menjadi kandidat
+    semua = np.array([LanjutGreedy(Transisi, u, jmlBaris, tetangga) for u in beam[np.argsort(-nilai, kind="stable")]])
+
+    pool = PoolKandidat(jmlKandidat, jarakMin)
+    pool.tambah(semua, SkorUrutan(Skor if Transisi is None else Transisi, semua))
+
+    return HasilAkhir(Skor, semua[0], beam.shape[1] - 1, mulai, habis, pool)
+
+# Ant Colony Optimization langsung di atas matrix skor N x N
+
+def ACO(Skor, jmlBaris, jmlSemut=32, maxIterasi=60, batasWaktu=1.0, alpha=1.0, beta=2.0, evaporasi=0.1, seed=None, jmlKandidat=1, jarakMin=None, jmlAnggota=None, tetangga=None):
+    mulai = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    jmlBaris = int(jmlBaris)
+    Transisi = SkorTransisi(Skor, jmlAnggota) if tetangga is None else None
+    # dengan indeks top-k, feromon dan heuristik hanya N x k (kolom ke-j = penerus ke-j)
+    kolom, nilaiPenerus = Penerus(Transisi, tetangga)
+    jmlLidi, k = kolom.shape
+
+    # heuristik: skor + 1 agar pasangan bernilai 0 tetap punya peluang dipilih
+    boleh = np.isfinite(nilaiPenerus)
+    heuristik = np.where(boleh, np.where(boleh, nilaiPenerus, 0) + 1, 0) ** beta
+    feromon = np.ones((jmlLidi, k))
+
+    terbaik, skorTerbaik = None, -np.inf
+    pool = PoolKandidat(jmlKandidat, jarakMin)
+    iterasi, habis = 0, False
+    while iterasi < maxIterasi:
+        if terbaik is not None and HabisWaktu(mulai, batasWaktu):
+            habis = True
+            break
+        iterasi += 1
 
-    result = list(result)
+        # semua semut dalam satu iterasi menyusun urutan secara bersamaan
+        urutan = np.empty((jmlSemut, jmlBaris), dtype=np.int64)
+        pos = np.zeros((jmlSemut, jmlBaris), dtype=np.int64)
+        urutan[:, 0] = rng.integers(0, jmlLidi, jmlSemut)
+        for t in range(1, jmlBaris):
+            bobot = (feromon[urutan[:, t-1]] ** alpha) * heuristik[urutan[:, t-1]]
+            kumulatif = np.cumsum(bobot, axis=1)
+            r = (1 - rng.random(jmlSemut)) * kumulatif[:, -1]
+            pos[:, t] = np.minimum((kumulatif < r[:, None]).sum(axis=1), k - 1)
+            urutan[:, t] = kolom[urutan[:, t-1], pos[:, t]]
 
-    temp = []
-    for k in range(0, jmlBaris):
-        p = result[k]
-        temp.append(p)
+        skor = SkorUrutan(Skor if Transisi is None else Transisi, urutan)
+        pool.tambah(urutan, skor)
+        pilih = int(np.argmax(skor))
+        if skor[pilih] > skorTerbaik:
+            terbaik, skorTerbaik = urutan[pilih].copy(), skor[pilih]
 
-    return temp
+        # penguapan lalu deposit feromon sebanding skor relatif tiap semut
+        feromon *= (1 - evaporasi)
+        deposit = np.repeat(skor / max(skorTerbaik, 1e-9), jmlBaris - 1)
+        np.add.at(feromon, (urutan[:, :-1].ravel(), pos[:, 1:].ravel()), deposit)
 
+    return HasilAkhir(Skor, terbaik, iterasi, mulai, habis, pool)
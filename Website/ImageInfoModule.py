@@ -0,0 +1,25 @@
+import os
+from functools import lru_cache
+from PIL import Image
+
+# Ukuran gambar dibaca dari header saja (PIL Image.open bersifat lazy, pixel tidak di-decode)
+# dan diingat per (path, mtime_ns), sehingga validasi upload dan halaman detail
+# tidak perlu decode gambar penuh hanya untuk tinggi dan lebar.
+
+# tag EXIF Orientation yang memutar gambar 90 derajat (lebar dan tinggi tertukar)
+_ORIENTASI = 0x0112
+_PUTAR90 = (5, 6, 7, 8)
+
+@lru_cache(maxsize=1024)
+def _ukuran(path, mtime_ns):
+    with Image.open(path) as img:
+        width, height = img.size
+        # cv2.imread memutar gambar sesuai EXIF, ukuran mengikuti hasil cv2
+        if img.getexif().get(_ORIENTASI) in _PUTAR90:
+            width, height = height, width
+    return height, width
+
+def UkuranGambar(path):
+    # (tinggi, lebar) seperti img.shape[:2] hasil cv2.imread
+    path = os.path.abspath(str(path))
+    return _ukuran(path, os.stat(path).st_mtime_ns)
@@ -0,0 +1,145 @@
+import os
+import uuid
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from django.conf import settings
+from django.core.cache import cache
+from .CreateImageModule import CreateImageMotif
+from .AssetModule import AsetMotif
+from .LibraryModule import LidiLibrary
+
+# Pool proses dibuat sekali per worker web, generate motif berjalan di luar GIL request
+_pool = None
+_pending = set()
+_lock = threading.Lock()
+logger = logging.getLogger(__name__)
+
+def _initWorker():
+    # pool memakai start method "spawn", Django di-setup ulang di setiap worker
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Website.settings")
+    import django
+    django.setup()
+
+def _getPool():
+    global _pool
+    with _lock:
+        if _pool is None:
+            # spawn, bukan fork: worker tidak mewarisi koneksi database thread request
+            _pool = ProcessPoolExecutor(max_workers=settings.MOTIF_JOB_WORKERS, initializer=_initWorker, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+def _submit(fn, *args):
+    # worker yang mati (misalnya OOM) membuat pool rusak permanen:
+    # pool dibuat ulang lalu job dikirim sekali lagi
+    global _pool
+    pool = _getPool()
+    try:
+        return pool.submit(fn, *args)
+    except BrokenProcessPool:
+        with _lock:
+            if _pool is pool:
+                _pool = None
+        return _getPool().submit(fn, *args)
+
+def RunMotifJob(job_id, fullpath, filename, jmlBaris, Baris, mode, username, jmlVarian, seed=None, pustaka=False):
+    # dijalankan di proses pool, progress ditulis ke cache bersama
+    def progress(selesai, total):
+        status = cache.get(job_id) or {}
+        status.update({'progress': 10 + int(90 * selesai / total), 'status': f'Membuat motif {selesai}/{total}...'})
+        cache.set(job_id, status, timeout=settings.MOTIF_JOB_TIMEOUT)
+
+    status = cache.get(job_id) or {}
+    status.update({'progress': 5, 'status': 'Memproses lidi...'})
+    cache.set(job_id, status, timeout=settings.MOTIF_JOB_TIMEOUT)
+
+    # pustaka lidi per user, atau satu pustaka bersama untuk seluruh toko
+    scope = "shared" if settings.MOTIF_LIBRARY_SCOPE == "shared" else username
+    pustaka = (settings.MOTIF_LIBRARY_ROOT, scope) if pustaka else None
+
+    Image = CreateImageMotif(fullpath, filename, jmlBaris, Baris, mode, username, settings.MOTIF_PNG_COMPRESS_LEVEL, settings.MOTIF_WEBP, seed, settings.MOTIF_SEARCH_BUDGET, pustaka, settings.MOTIF_SPARSE_K, settings.MOTIF_SPARSE_ROWS)
+    hasil = Image.imageBatch(jmlVarian, progress=progress)
+
+    # setiap upload masuk ke pustaka agar bisa dipakai generate berikutnya; disimpan oleh
+    # job terpisah setelah hasil dipublikasikan (tanpa decode ulang), lihat SubmitPustakaJob
+    simpan = None if pustaka is not None else (scope,) + Image.dataPustaka()
+
+    return hasil, Image.rawUrl, simpan
+
+def SubmitMotifJob(fullpath, filename, jmlBaris, Baris, mode, username, jmlVarian, context, seed=None, pustaka=False):
+    # mengembalikan job_id, atau None jika antrian sudah penuh
+    job_id = uuid.uuid4().hex
+
+    # cek dan ambil tempat antrian dalam satu lock agar dua request tidak sama-sama lolos
+    with _lock:
+        if len(_pending) >= settings.MOTIF_JOB_QUEUE:
+            return None
+        _pending.add(job_id)
+
+    cache.set(job_id, dict(context, progress=0, status='Menunggu antrian...', user=username), timeout=settings.MOTIF_JOB_TIMEOUT)
+
+    try:
+        future = _submit(RunMotifJob, job_id, fullpath, filename, jmlBaris, Baris, mode, username, jmlVarian, seed, pustaka)
+    except Exception:
+        with _lock:
+            _pending.discard(job_id)
+        raise
+
+    def done(future):
+        with _lock:
+            _pending.discard(job_id)
+
+        status = cache.get(job_id) or dict(context, user=username)
+        try:
+            hasil, rawUrl, simpan = future.result()
+            status.update({'progress': 100, 'status': 'Completed', 'hasil': hasil})
+            if rawUrl is not None:
+                status['raw_url'] = rawUrl
+        except Exception as e:
+            status.update({'progress': 100, 'status': 'Error', 'error': str(e)})
+            simpan = None
+        cache.set(job_id, status, timeout=settings.MOTIF_JOB_TIMEOUT)
+
+        if simpan is not None:
+            SubmitPustakaJob(*simpan)
+
+    future.add_done_callback(done)
+
+    return job_id
+
+def RunAsetJob(id, imgBefore, imgAfter):
+    # diimpor di sini: modul ini di-unpickle worker spawn sebelum django.setup()
+    from .models import MotifForm1
+
+    aset = AsetMotif(imgBefore, imgAfter).buat()
+    MotifForm1.objects.filter(id=id).update(aset=aset)
+
+def SubmitAsetJob(id, imgBefore, imgAfter):
+    # aset turunan motif tersimpan dibuat di pool, gagal di sini dicatat di log
+    # lalu diulang oleh LengkapiMotif() saat motif pertama kali dibuka
+    try:
+        future = _submit(RunAsetJob, id, imgBefore, imgAfter)
+    except Exception:
+        logger.exception("Gagal membuat aset motif %s", id)
+        return None
+    future.add_done_callback(lambda future: _catatGagal(future, "Gagal membuat aset motif %s", id))
+    return future
+
+def RunPustakaJob(scope, hashLidi, rows, Array_data):
+    LidiLibrary(settings.MOTIF_LIBRARY_ROOT, scope, rows.shape[1]).tambah(hashLidi, rows, Array_data)
+
+def SubmitPustakaJob(scope, hashLidi, rows, Array_data):
+    # generate sudah selesai: gagal menambah pustaka (I/O, flock, ...) hanya dicatat di log
+    try:
+        future = _submit(RunPustakaJob, scope, hashLidi, rows, Array_data)
+    except Exception:
+        logger.exception("Gagal menambah lidi %s ke pustaka %s", hashLidi, scope)
+        return None
+    future.add_done_callback(lambda future: _catatGagal(future, "Gagal menambah lidi %s ke pustaka %s", hashLidi, scope))
+    return future
+
+def _catatGagal(future, pesan, *args):
+    if future.exception() is not None:
+        logger.error(pesan, *args, exc_info=future.exception())
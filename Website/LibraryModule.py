@@ -0,0 +1,195 @@
+import os
+import json
+import threading
+import numpy as np
+from numpy.lib.format import open_memmap
+from .Function import PackLidi
+from .Function import SkorBlok
+from .FileModule import TulisAtomik
+from .FileModule import SimpanJson
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Pustaka lidi: baris dari semua upload dalam satu scope (user atau toko) disimpan sekali
+# di array on-disk (memmap), dipisah per lebar lidi karena hanya baris dengan lebar sama
+# yang bisa disusun menjadi satu motif.
+#
+# {root}/{scope}/{lebar}/
+#   manifest.json   jumlah baris, kapasitas, dan hash lidi sumber beserta posisi barisnya
+#   rows.npy        baris RGB (kapasitas x lebar x 3) untuk membuat gambar motif
+#   hitam.npy, kiri.npy, kanan.npy, putih.npy, density.npy
+#                   baris packed hasil PackLidi untuk menghitung skor
+#   skor.npy        matrix skor kapasitas x kapasitas (float32)
+#
+# Kapasitas dibuat dua kali lipat saat penuh, sehingga menambah lidi hanya menghitung
+# blok skor baris baru terhadap semua baris (tanpa menghitung ulang N x N).
+
+_lock = threading.Lock()
+
+class LidiLibrary:
+    def __init__(self, root, scope, lebar):
+        self.folder = os.path.join(root, str(scope), str(int(lebar)))
+        self.lebar = int(lebar)
+        self.words = (self.lebar + 63) // 64
+        self.wordsGeser = (self.lebar + 62) // 64
+        os.makedirs(self.folder, exist_ok=True)
+        self.manifest = self.bacaManifest()
+
+    def path(self, nama):
+        return os.path.join(self.folder, nama)
+
+    def bacaManifest(self):
+        try:
+            with open(self.path("manifest.json")) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"lebar": self.lebar, "jumlah": 0, "kapasitas": 0, "sumber": []}
+
+    def tulisManifest(self):
+        # atomik agar pembaca tidak melihat manifest setengah jadi
+        SimpanJson(self.manifest, self.path("manifest.json"))
+
+    def kunci(self):
+        return KunciPustaka(self.path("lock"))
+
+    def bentuk(self, kapasitas):
+        return {
+            "rows": ((kapasitas, self.lebar, 3), np.uint8),
+            "hitam": ((kapasitas, self.words), np.uint64),
+            "kiri": ((kapasitas, self.wordsGeser), np.uint64),
+            "kanan": ((kapasitas, self.wordsGeser), np.uint64),
+            "putih": ((kapasitas,), np.int64),
+            "density": ((kapasitas,), np.float64),
+            "skor": ((kapasitas, kapasitas), np.float32),
+        }
+
+    def array(self, nama, mode="r"):
+        return open_memmap(self.path(f"{nama}.npy"), mode=mode)
+
+    def siapkan(self, jumlah):
+        # perbesar kapasitas (2x) jika jumlah baris melebihi kapasitas sekarang
+        kapasitas = self.manifest["kapasitas"]
+        if jumlah <= kapasitas:
+            return
+
+        baru = max(2 * kapasitas, jumlah, 64)
+        n = self.manifest["jumlah"]
+        for nama, (shape, dtype) in self.bentuk(baru).items():
+            with TulisAtomik(self.path(f"{nama}.npy")) as tmp:
+                arr = open_memmap(tmp, mode="w+", dtype=dtype, shape=shape)
+                if n > 0:
+                    lama = self.array(nama)
+                    if nama == "skor":
+                        for i in range(0, n, 1024):
+                            j = min(i + 1024, n)
+                            arr[i:j, :n] = lama[i:j, :n]
+                    else:
+                        arr[:n] = lama[:n]
+                    del lama
+                arr.flush()
+                del arr
+
+        self.manifest["kapasitas"] = baru
+
+    def packed(self, awal, akhir):
+        return {
+            "hitam": self.array("hitam")[awal:akhir],
+            "kiri": self.array("kiri")[awal:akhir],
+            "kanan": self.array("kanan")[awal:akhir],
+            "putih": self.array("putih")[awal:akhir],
+            "density": self.array("density")[awal:akhir],
+            "lebar": self.lebar,
+        }
+
+    def tambah(self, hashLidi, rows, Array_data, blok=1024):
+        # tambahkan baris lidi (sekali per hash), hasil (awal, jumlah) posisi barisnya di pustaka
+        with self.kunci():
+            self.manifest = self.bacaManifest()
+            for sumber in self.manifest["sumber"]:
+                if sumber["hash"] == hashLidi:
+                    return sumber["awal"], sumber["jumlah"]
+
+            awal = self.manifest["jumlah"]
+            jumlah = len(rows)
+            akhir = awal + jumlah
+            self.siapkan(akhir)
+
+            baru = PackLidi(Array_data)
+            for nama in ["hitam", "kiri", "kanan", "putih", "density"]:
+                arr = self.array(nama, "r+")
+                arr[awal:akhir] = baru[nama]
+                arr.flush()
+            arr = self.array("rows", "r+")
+            arr[awal:akhir] = rows
+            arr.flush()
+
+            # hanya blok yang melibatkan baris baru: baris baru x semua dan semua lama x baris baru
+            skor = self.array("skor", "r+")
+            for i in range(0, akhir, blok):
+                j = min(i + blok, akhir)
+                skor[awal:akhir, i:j] = SkorBlok(baru, self.packed(i, j))
+                if i < awal:
+                    skor[i:min(j, awal), awal:akhir] = SkorBlok(self.packed(i, min(j, awal)), baru)
+            skor.flush()
+            del skor, arr
+
+            self.manifest["jumlah"] = akhir
+            self.manifest["sumber"].append({"hash": hashLidi, "awal": awal, "jumlah": jumlah})
+            self.tulisManifest()
+
+            return awal, jumlah
+
+    def jumlah(self):
+        return self.manifest["jumlah"]
+
+    def rows(self):
+        return self.array("rows")[:self.jumlah()]
+
+    def hitam(self):
+        return self.array("hitam")[:self.jumlah()]
+
+    def skor(self):
+        return self.array("skor")[:self.jumlah(), :self.jumlah()]
+
+class SkorPustaka:
+    # matrix skor kelas baris pustaka tanpa dimuat utuh: Skor[i, j] = skor[wakil[i], wakil[j]],
+    # blok baris (IndeksTetangga) dan elemen (SkorUrutan) dibaca langsung dari memmap
+    def __init__(self, skor, wakil):
+        self.skor = skor
+        self.wakil = np.asarray(wakil)
+        self.shape = (len(self.wakil), len(self.wakil))
+
+    def __len__(self):
+        return len(self.wakil)
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            baris, kolom = key
+            return np.asarray(self.skor[self.wakil[baris], self.wakil[kolom]], dtype=np.float64)
+        return np.asarray(self.skor[self.wakil[key]][:, self.wakil], dtype=np.float64)
+
+    def padat(self):
+        # matrix C x C di memori, untuk mode yang membutuhkan semua pasangan
+        return np.asarray(self.skor[np.ix_(self.wakil, self.wakil)], dtype=np.float64)
+
+class KunciPustaka:
+    # kunci antar thread dan antar proses (flock) selama pustaka diubah
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+
+    def __enter__(self):
+        _lock.acquire()
+        if fcntl is not None:
+            self.file = open(self.path, "a")
+            fcntl.flock(self.file, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *args):
+        if self.file is not None:
+            fcntl.flock(self.file, fcntl.LOCK_UN)
+            self.file.close()
+        _lock.release()
@@ -1,174 +1,130 @@
-import cv2
 import os
-from PIL import Image, ImageDraw
+import json
+from PIL import Image
 import numpy as np
+from .ImageInfoModule import UkuranGambar
+from .FileModule import TulisAtomik
+from .FileModule import SimpanJson
+
+GRID = 10
+ABU = (127, 127, 127)
+TOSCA = (0, 153, 153)
+MERAH = (255, 0, 0)
+
+def Perbesar(img, faktor=GRID):
+    # nearest neighbour: setiap pixel menjadi blok faktor x faktor
+    return np.repeat(np.repeat(img, faktor, axis=0), faktor, axis=1)
+
+def GarisGrid(img, warna, jarak=GRID, horizontal=True):
+    # garis grid 1 pixel setiap jarak pixel, langsung ke slice array (tanpa ImageDraw)
+    img = np.array(img, dtype=np.uint8)
+    img[:, ::jarak] = warna
+    if horizontal:
+        img[::jarak, :] = warna
+    return img
+
+def SimpanAtomik(img, path):
+    # format dari ekstensi path tujuan, file sementara berakhiran .tmp
+    with TulisAtomik(path) as tmp:
+        Image.fromarray(img).save(tmp, format=Image.registered_extensions()[os.path.splitext(path)[1]])
+
+def GarisMerah(img, tebal=3):
+    # garis horizontal merah di tengah gambar
+    img = np.array(img, dtype=np.uint8)
+    tengah = img.shape[0] // 2
+    img[max(tengah - tebal // 2, 0):tengah + tebal // 2 + 1, :] = MERAH
+    return img
+
 class Motif:
     def __init__(self, fullpath):
         self.fullpath = fullpath
-    
-    def UrutanLidi(self):
-        
-        image_fullpath = self.fullpath[1:]
-
-        image = cv2.imread(image_fullpath)
-
-        h, w, c = image.shape
-
-        temp = []
-        for i in range(1, 1+h):
-            temp.append(i)
-
-        return f"{temp}"
 
     def GridLidi(self):
         image_fullpath = self.fullpath[1:]
 
-        if os.path.exists(f"{image_fullpath[:-4]}_grid.jpg"):
-            return f"{image_fullpath[:-4]}_grid.jpg"
+        if not os.path.exists(f"{image_fullpath[:-4]}_grid.jpg"):
+            self.renderLidi()
+
+        return f"{image_fullpath[:-4]}_grid.jpg"
 
-        else:
-            image = Image.open(image_fullpath)
+    def GridHelp(self):
+        image_fullpath = self.fullpath[1:]
 
-            width, height, = image.size
-            image = image.resize((width * 10, height * 10), Image.Resampling.NEAREST)
+        if not os.path.exists(f"{image_fullpath[:-4]}_grid_help.jpg"):
+            self.renderLidi()
 
-            draw = ImageDraw.Draw(image)
+        return f"{image_fullpath[:-4]}_grid_help.jpg"
 
-            width, height, = image.size
+    def renderLidi(self):
+        # _grid.jpg dan _grid_help.jpg dibuat dari satu kali decode lidi
+        image_fullpath = self.fullpath[1:]
 
-            grid_size = 10
+        lidi = np.asarray(Image.open(image_fullpath).convert("RGB"))
+        height, width = lidi.shape[:2]
 
-            for x in range(0, width, grid_size):
-                draw.line((x, 0, x, height), fill=(127, 127, 127))
-            
-            for y in range(0, height, grid_size):
-                draw.line((0, y, width, y), fill=(127, 127, 127))
+        grid = GarisGrid(Perbesar(lidi, GRID), ABU)
+        SimpanAtomik(grid, f"{image_fullpath[:-4]}_grid.jpg")
 
-            image.save(f"{image_fullpath[:-4]}_grid.jpg")
+        # penggaris kolom: satu baris putih dengan garis vertikal saja
+        bantu = np.full((GRID, width * GRID, 3), 255, dtype=np.uint8)
+        bantu = GarisGrid(bantu, TOSCA, horizontal=False)
+        SimpanAtomik(bantu, f"{image_fullpath[:-4]}_grid_help.jpg")
 
-            return f"{image_fullpath[:-4]}_grid.jpg"
-    
     def GridMotif(self):
-        image_fullpath = self.fullpath
-        image_fullpath = image_fullpath[1:]
-        
+        image_fullpath = self.fullpath[1:]
 
         if os.path.exists(f"{image_fullpath[:-4]}_grid.png"):
             return f"{image_fullpath[:-4]}_grid.png"
-        
-        else: 
-            png_image = Image.open(image_fullpath)
-            background = Image.new('RGB', png_image.size, (255, 255, 255))
-            
-            background.paste(png_image, mask=png_image.split()[3])
-            
-            image = background
-            draw = ImageDraw.Draw(image)
 
-            width, height = image.size
+        # motif sudah berukuran 10x, cukup ditempel di atas latar putih lalu diberi grid
+        motif = np.asarray(Image.open(image_fullpath).convert("RGBA"), dtype=np.uint16)
+        alpha = motif[..., 3:]
+        image = ((motif[..., :3] * alpha + 255 * (255 - alpha) + 127) // 255).astype(np.uint8)
 
-            grid_size = 10
+        image = GarisGrid(image, ABU)
+        SimpanAtomik(image, f"{image_fullpath[:-4]}_grid.png")
 
-            for x in range(0, width, grid_size):
-                draw.line((x, 0, x, height), fill=(127, 127, 127))
+        # garis merah ikut dibuat dari array yang sama (lihat redLine)
+        SimpanAtomik(GarisMerah(image), f"{image_fullpath[:-4]}_grid_red.jpg")
 
-            for y in range(0, height, grid_size):
-                draw.line((0, y, width, y), fill=(127, 127, 127))
+        return f"{image_fullpath[:-4]}_grid.png"
 
-            image.save(f"{image_fullpath[:-4]}_grid.png")
-            
-            return f"{image_fullpath[:-4]}_grid.png"
-        
     def redLine(self):
         image_fullpath = self.fullpath
 
-        if os.path.exists(f"{image_fullpath[:-4]}_red.jpg"):
-            return f"{image_fullpath[:-4]}_red.jpg"
-
-        else:
-            image = Image.open(image_fullpath)
-            draw = ImageDraw.Draw(image)
-            
-            width, height = image.size
-            
-            x1, y1 = 0, height // 2
-            x2, y2 = width, height // 2
+        if not os.path.exists(f"{image_fullpath[:-4]}_red.jpg"):
+            image = np.asarray(Image.open(image_fullpath).convert("RGB"))
+            SimpanAtomik(GarisMerah(image), f"{image_fullpath[:-4]}_red.jpg")
 
-            draw.line((x1, y1, x2, y2), fill='red', width=3)
+        return f"{image_fullpath[:-4]}_red.jpg"
 
-            
-            draw = ImageDraw.Draw(image)
-
-            image.save(f"{image_fullpath[:-4]}_red.jpg")
-            return f"{image_fullpath[:-4]}_red.jpg"
-        
-    def GridHelp(self):
-
-        image_fullpath = self.fullpath[1:]
-
-        if os.path.exists(f"{image_fullpath[:-4]}_grid_help.jpg"):
-            return f"{image_fullpath[:-4]}_grid_help.jpg"
-
-        else:
-            image = Image.open(image_fullpath)
-
-            width, height = image.size
-
-            image = Image.new('RGB', (width, 1), color=(255, 255, 255))
-
-            width, height = image.size
-            image = image.resize((width * 10, height * 10))
-
-            # Create a draw object
-            draw = ImageDraw.Draw(image)
-
-            width, height = image.size
-
-            # Set the grid size
-            grid_size = 10
+    def SliceSprite(self):
+        # gambar grid sendiri menjadi sprite sheet, setiap stripe 10 pixel ditampilkan
+        # dengan CSS background-position dari tabel offset (satu file JSON, satu request gambar)
+        namaFile = self.fullpath
+        tabel = f"{namaFile[:-4]}_slice.json"
 
-            # Draw vertical gridlines
-            for x in range(0, width, grid_size):
-                draw.line((x, 0, x, height), fill=(0, 153, 153))
+        if os.path.exists(tabel):
+            with open(tabel) as f:
+                return json.load(f)
 
+        height, width = UkuranGambar(namaFile)
 
-            # Save the image with gridlines
-            image.save(f"{image_fullpath[:-4]}_grid_help.jpg")
+        baris = []
+        for y in range(0, height, GRID):
+            # posisi background dalam persen, skala sheet = height / GRID kali tinggi stripe
+            posisi = 100 * y / (height - GRID) if height > GRID else 0
+            baris.append({"y": y, "posisi": round(posisi, 4)})
 
-            return f"{image_fullpath[:-4]}_grid_help.jpg"
+        sprite = {
+            "sheet": namaFile,
+            "lebar": width,
+            "tinggi": height,
+            "stripe": GRID,
+            "skala": round(100 * height / GRID, 4),
+            "baris": baris,
+        }
 
-    def Slice(self):
-        namaFile = self.fullpath
+        SimpanJson(sprite, tabel)
 
-        namaDirektori = f"{namaFile[:-4]}"
-        Direktori = f"{namaDirektori}"
-        temp = []
-        if(not os.path.exists(Direktori)):
-            os.mkdir(Direktori)
-
-            image = Image.open(namaFile)
-
-            width, height = image.size
-
-            #Pemisahan Baris
-            img = cv2.imread(f"{namaFile}", 1)
-            img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-            for i in range(0,width, 10):
-                    try:
-                        na = np.array(img[i:i+10, : ], dtype=np.uint8)
-                        # membuat Numpy array menjadi PIL Image dan menyimpan menjadi bentuk jpg
-                        Image.fromarray(na).save(f"{namaDirektori}/Baris"+str(i)+".jpg")
-                        temp.append(f"{namaDirektori}/Baris"+str(i)+".jpg")
-                    except ValueError:
-                        break
-            return f"{temp}"
-        else:
-            image = Image.open(namaFile)
-            width, height = image.size
-
-            for i in range(0, height, 10):
-                try:
-                    temp.append(f"{namaDirektori}/Baris"+str(i)+".jpg")
-                except ValueError:
-                    break
-            return f"{temp}"
\ No newline at end of file
+        return sprite
@@ -1,110 +1,84 @@
-import numpy as np
 import os
+import numpy as np
 import cv2
-from PIL import ImageOps
 from PIL import Image
 
-def SeparateImage(img, namaDirektori):
-    for i in range(0,72):
-        try:
-            na = np.array(img[i:i+1, : ], dtype=np.uint8)
-            # membuat Numpy array menjadi PIL Image dan menyimpan menjadi bentuk jpg
-            Image.fromarray(na).save(f"{namaDirektori}/Baris"+str(i)+".jpg")
-            
-        except ValueError:
-            break
-
-
-
-def ConvertRGB(img, Lidi, height, namaDirektori):
-    for i in range(0,height):
-    
-        try:
-            img_temp = Image.open(f'{namaDirektori}/Baris'+str(i)+'.jpg')
-            img_temp.convert("RGBA")
-            datas = img_temp.getdata()
-            img.append(datas)
-            Lidi.append(i)
-        except FileNotFoundError:
-            break
-    return [img, Lidi]
-
-
-
-def ConvertArrayImage(img, Array_data):
-    for i in range(0,72):
-        try:
-            Baca_data = []
-            datas = img[i]
-            for item in datas:
-                if item[0] > 200 and item[1] > 200 and item[2] > 200:
-                    Baca_data.append(1)
-                else:
-                    Baca_data.append(2)
-            Array_data.append(Baca_data)
-        except IndexError:
-            break
-    return Array_data
-
-
-
-def ConvertLiditoArray(img, height, namaDirektori):
-    for i in range(0,height):
-        try:
-            img.append(cv2.imread(f'{namaDirektori}/Baris'+str(i)+'.jpg', 1))
-        except:
-            break
+def ReadLidi(fullpath):
+    # decode gambar lidi satu kali, semua tahap berikutnya memakai array ini
+    img = cv2.imread(str(fullpath), 1)
+    if img is None:
+        raise ValueError(f"Gambar lidi tidak dapat dibaca: {fullpath}")
     return img
 
 
 
+def ConvertBinaryArray(img):
+    # array-in/array-out: 1 untuk piksel putih (semua channel > 200), 2 untuk lainnya
+    img = np.asarray(img)
+    putih = (img[..., :3] > 200).all(axis=-1)
+    return np.where(putih, 1, 2).astype(np.uint8)
+
+
+
+def ConvertLiditoArray(img):
+    # BGR (cv2) ke RGB untuk disusun menjadi motif, tetap berupa view
+    return img[:, :, ::-1]
+
+
+
+def MirrorIndex(a, jmlBaris):
+    # motif simetris: posisi i memakai a[min(i, jmlBaris-1-i)]
+    # jmlBaris genap -> a + a[::-1], ganjil -> baris tengah tidak diulang
+    i = np.arange(jmlBaris)
+    return np.asarray(a, dtype=np.intp)[np.minimum(i, jmlBaris - 1 - i)]
+
+
+
 def CreateImage(a, img):
-    while len(a) >=0:
-        try:
-            image1 = a.pop(0)
-            image2 = a.pop(0)
-            mix = np.vstack((img[image1], img[image2]))
-            while len(a) >=0:
-                image3 = a.pop(0)
-                mix = np.vstack((mix, img[image3]))
-        except Exception:
-            break
+    # satu gather rows[a] ke buffer yang dialokasikan sekali
+    a = np.asarray(a, dtype=np.intp)
+    mix = np.empty((len(a),) + img.shape[1:], dtype=img.dtype)
+    np.take(img, a, axis=0, out=mix)
     return mix
 
 
 
-def ScaleImage(img):
-    img = ImageOps.scale(img, 10, resample=0)
-    return img
-
+def ScaleArray(img, faktor=10):
+    # upscale nearest-neighbour tanpa resample: setiap piksel menjadi blok faktor x faktor
+    h, w = img.shape[:2]
+    blok = np.broadcast_to(img[:, None, :, None], (h, faktor, w, faktor) + img.shape[2:])
+    return blok.reshape((h * faktor, w * faktor) + img.shape[2:])
 
 
-def ProcesImage(img):
-    img = img.convert("RGBA")
-    datas = img.getdata()
 
-    newData = []
+def SaveImage(img, path, compressLevel=6, webp=False):
+    # compressLevel PNG 0-9: 1 cepat, 9 paling kecil; webp lossless ditulis di samping PNG
+    img = Image.fromarray(img)
+    img.save(path, format="PNG", compress_level=compressLevel)
+    if webp:
+        img.save(os.path.splitext(path)[0] + ".webp", format="WEBP", lossless=True, method=4)
+    return path
 
-    for item in datas:
-        if item[0] > 150 and item[1] > 150 and item[2] > 200:
-            newData.append((255, 255, 255, 0))
-        else:
-            newData.append(item)
 
-    img.putdata(newData)
 
-    datas = img.getdata()
+def ProcesImageArray(img):
+    # array-in/array-out: latar putih menjadi transparan, benang gelap menjadi hitam pekat
+    img = np.asarray(img)
+    rgba = np.empty(img.shape[:2] + (4,), dtype=np.uint8)
+    rgba[..., :3] = img[..., :3]
+    rgba[..., 3] = img[..., 3] if img.shape[-1] == 4 else 255
 
+    r, g, b = rgba[..., 0], rgba[..., 1], rgba[..., 2]
+    putih = (r > 150) & (g > 150) & (b > 200)
+    hitam = ~putih & (r < 150) & (g < 150) & (b < 200)
 
-    newData = []
+    rgba[putih] = (255, 255, 255, 0)
+    rgba[hitam] = (0, 0, 0, 255)
 
+    return rgba
 
-    for item in datas:
-        if item[0] < 150 and item[1] < 150 and item[2] < 200:
-            newData.append((0, 0, 0, 255))
-        else:
-            newData.append(item)
 
-    img.putdata(newData)
 
-    return img
\ No newline at end of file
+def ProcesImage(img):
+    img = img.convert("RGBA")
+    return Image.fromarray(ProcesImageArray(np.asarray(img)), "RGBA")
\ No newline at end of file
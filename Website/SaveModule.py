@@ -1,4 +1,5 @@
 import uuid
+import shutil
 from PIL import Image
 import os
 
@@ -14,8 +15,7 @@ class Save:
         namaDirektori = "media/Hasil"
         Direktori = namaDirektori
 
-        if(not os.path.exists(Direktori)):
-            os.mkdir(Direktori)
+        os.makedirs(Direktori, exist_ok=True)
         unique_file_name = uuid.uuid4().hex
 
         img = img.save(f"media/Hasil/{unique_file_name}.jpg")
@@ -31,18 +31,17 @@ class Save:
 
         img = Image.open(str(image_fullpath))
 
+        os.makedirs("media/Hasil", exist_ok=True)
         unique_file_name = uuid.uuid4().hex
 
         img = img.save(f"media/Hasil/{unique_file_name}.png")
 
-        folder_path = (f"media/{folderUser}")
-        test = os.listdir(folder_path)
-        for images in test:
-            if images.endswith(".png"):
-                os.remove(os.path.join(folder_path, images))
-        
-        for images in test:
-            if images.endswith(".jpg"):
-                os.remove(os.path.join(folder_path, images))
+        # hanya workspace generate ini yang dihapus, generate lain milik user yang sama
+        # (tab atau request lain yang berjalan bersamaan) tidak tersentuh
+        workspace = os.path.dirname(image_fullpath)
+        if(os.path.dirname(workspace) == f"media/{folderUser}"):
+            shutil.rmtree(workspace, ignore_errors=True)
+        elif(os.path.exists(image_fullpath)):
+            os.remove(image_fullpath)
 
         return f"/media/Hasil/{unique_file_name}.png"
\ No newline at end of file
@@ -0,0 +1,104 @@
+# Website/management/commands/benchmark_motif.py
+import os
+import json
+import time
+import shutil
+import platform
+import tempfile
+import subprocess
+import tracemalloc
+import numpy as np
+import cv2
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from Website.CreateImageModule import CreateImageMotif
+from Website.CacheModule import lidiCache
+
+def parseList(value):
+    return [int(x) for x in value.split(',') if x.strip()]
+
+def SyntheticLidi(height, width, rng):
+    # lidi sintetis: baris hitam/putih acak dengan run seperti benang, disimpan sebagai jpg
+    img = np.full((height, width), 255, dtype=np.uint8)
+    for i in range(height):
+        j = 0
+        while j < width:
+            panjang = int(rng.integers(1, 7))
+            if rng.random() < 0.5:
+                img[i, j:j+panjang] = 0
+            j += panjang
+    return cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+
+class Command(BaseCommand):
+    help = 'Benchmark generate motif per tahap (decode, binarize, score, search, assemble, encode) dan simpan ke JSON'
+
+    def add_arguments(self, parser):
+        # batas ukuran mengikuti CheckModule.Check: tinggi 6-12, lebar 2-140, jumlah baris 2-40
+        parser.add_argument('--heights', default='6,9,12')
+        parser.add_argument('--widths', default='2,70,140')
+        parser.add_argument('--rows', default='2,10,20,40')
+        parser.add_argument('--modes', default='1,2,3,4,5,6')
+        parser.add_argument('--repeat', type=int, default=1)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--budget', type=float, default=None)
+        parser.add_argument('--output', default='bench_output.json')
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options['seed'])
+        folder = tempfile.mkdtemp(prefix='benchmark_motif_')
+        results = []
+
+        try:
+            for height in parseList(options['heights']):
+                for width in parseList(options['widths']):
+                    fullpath = os.path.join(folder, f'lidi_{height}x{width}.jpg')
+                    cv2.imwrite(fullpath, SyntheticLidi(height, width, rng))
+
+                    for jmlBaris in parseList(options['rows']):
+                        for mode in parseList(options['modes']):
+                            for ulang in range(options['repeat']):
+                                results.append(self.run(fullpath, height, width, jmlBaris, mode, options['budget'], options['seed']))
+                                self.stdout.write(f"h={height} w={width} baris={jmlBaris} mode={mode}: {results[-1]['total']:.4f}s")
+        finally:
+            shutil.rmtree(folder, ignore_errors=True)
+
+        try:
+            commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, cwd=settings.BASE_DIR).stdout.strip()
+        except OSError:
+            commit = ''
+
+        with open(options['output'], 'w') as f:
+            json.dump({
+                'commit': commit,
+                'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'results': results,
+            }, f, indent=2)
+
+        self.stdout.write(self.style.SUCCESS(f"{len(results)} hasil benchmark disimpan ke {options['output']}"))
+
+    def run(self, fullpath, height, width, jmlBaris, mode, budget=None, seed=None):
+        # cache preprocessing dikosongkan dan cache hasil dilewati agar setiap run
+        # mengukur semua tahap; seed tetap agar run bisa dibandingkan antar commit
+        lidiCache.clear()
+
+        Image = CreateImageMotif(fullpath, os.path.basename(fullpath), str(jmlBaris), '1', str(mode), 'benchmark', seed=seed, batasWaktu=budget, cacheHasil=False)
+
+        tracemalloc.start()
+        mulai = time.perf_counter()
+        Image.imageBatch(1)
+        total = time.perf_counter() - mulai
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return {
+            'height': height,
+            'width': width,
+            'jmlBaris': jmlBaris,
+            'mode': mode,
+            'stages': {k: round(v, 6) for k, v in Image.waktu.items()},
+            'search': Image.statistik[0] if Image.statistik else None,
+            'total': round(total, 6),
+            'peak_bytes': peak,
+        }
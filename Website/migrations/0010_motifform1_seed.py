@@ -0,0 +1,18 @@
+# Generated by Django 4.1.1 on 2026-10-18 07:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Website', '0009_uloscharacteristic_uloscolorthread'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='motifform1',
+            name='seed',
+            field=models.TextField(blank=True, default=''),
+        ),
+    ]
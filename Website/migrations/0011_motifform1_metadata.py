@@ -0,0 +1,60 @@
+# Generated by Django 4.1.1 on 2026-10-18 07:30
+
+from django.db import migrations, models
+from PIL import Image
+
+
+def ukuran_lidi(path):
+    # (tinggi, lebar) dari header, diputar sesuai EXIF seperti cv2.imread
+    with Image.open(path) as img:
+        width, height = img.size
+        if img.getexif().get(0x0112) in (5, 6, 7, 8):
+            width, height = height, width
+    return height, width
+
+
+def isi_metadata(apps, schema_editor):
+    # motif lama: urutanLidi "1, 2, 3" menjadi list int, ukuran lidi dibaca dari header gambar;
+    # gambar yang hilang atau rusak dilewati dan dilengkapi LengkapiMotif saat dibuka
+    MotifForm1 = apps.get_model('Website', 'MotifForm1')
+    for motif in MotifForm1.objects.all().iterator():
+        try:
+            motif.urutan = [int(x) for x in motif.urutanLidi.strip('[]').split(',') if x.strip()]
+        except ValueError:
+            motif.urutan = []
+        try:
+            motif.tinggiLidi, motif.lebarLidi = ukuran_lidi(motif.imgBefore[1:])
+        except OSError:
+            pass
+        motif.save(update_fields=['urutan', 'tinggiLidi', 'lebarLidi'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Website', '0010_motifform1_seed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='motifform1',
+            name='aset',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='motifform1',
+            name='lebarLidi',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='motifform1',
+            name='tinggiLidi',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='motifform1',
+            name='urutan',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.RunPython(isi_metadata, migrations.RunPython.noop),
+    ]
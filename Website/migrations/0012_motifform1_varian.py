@@ -0,0 +1,18 @@
+# Generated by Django 4.1.1 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Website', '0011_motifform1_metadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='motifform1',
+            name='varian',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
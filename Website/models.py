@@ -14,8 +14,17 @@ class MotifForm1(models.Model):
     jenisGenerate = models.TextField()
     jmlBaris = models.TextField()
     user = models.TextField()
+    seed = models.TextField(blank=True, default='')
+    varian = models.IntegerField(null=True, blank=True)
     time = models.DateTimeField(auto_now_add= True)
 
+    # metadata terstruktur diisi saat disimpan, halaman detail tidak perlu decode gambar atau eval:
+    # urutan baris motif, ukuran gambar lidi, dan manifest aset turunan (grid, sprite slice, zip)
+    urutan = models.JSONField(default=list, blank=True)
+    tinggiLidi = models.IntegerField(null=True, blank=True)
+    lebarLidi = models.IntegerField(null=True, blank=True)
+    aset = models.JSONField(null=True, blank=True)
+
 class UlosColorThread(models.Model):
     CODE = models.CharField(max_length=10, primary_key=True)
     hsv = models.CharField(max_length=50)
@@ -181,6 +181,43 @@ STATICFILES_DIRS = [
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Cache dipakai bersama oleh semua worker web dan proses pool generate motif
+# (status job generate motif dan progress pewarnaan)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, 'django_cache'),
+    }
+}
+
+# Job generate motif berjalan di process pool terbatas
+MOTIF_JOB_WORKERS = int(os.environ.get('MOTIF_JOB_WORKERS', 2))
+MOTIF_JOB_QUEUE = int(os.environ.get('MOTIF_JOB_QUEUE', 32))
+MOTIF_JOB_TIMEOUT = 3600
+
+# Batas waktu search (detik) untuk semua varian dalam satu job; kualitas motif bisa
+# ditukar dengan waktu respon. None berarti setiap mode memakai batas bawaannya sendiri.
+MOTIF_SEARCH_BUDGET = float(os.environ.get('MOTIF_SEARCH_BUDGET', 4.0))
+
+# Encoder hasil motif: level kompresi PNG 0-9 (1 cepat, 9 paling kecil)
+# dan WebP lossless yang ditulis di samping PNG untuk koneksi lambat.
+# WebP menambah waktu encode tiap varian, jadi default mati (MOTIF_WEBP=1 untuk menyalakan)
+MOTIF_PNG_COMPRESS_LEVEL = int(os.environ.get('MOTIF_PNG_COMPRESS_LEVEL', 6))
+MOTIF_WEBP = os.environ.get('MOTIF_WEBP', '0') == '1'
+
+# Pustaka lidi (memmap di luar folder media): baris dari semua upload bisa dipakai
+# bersama. MOTIF_LIBRARY_SCOPE 'user' = pustaka per user, 'shared' = satu pustaka toko
+MOTIF_LIBRARY_ROOT = os.environ.get('MOTIF_LIBRARY_ROOT', os.path.join(BASE_DIR, 'lidi_library'))
+MOTIF_LIBRARY_SCOPE = os.environ.get('MOTIF_LIBRARY_SCOPE', 'user')
+
+# Lama cache hasil generate (lidi, jmlBaris, mode, seed) -> urutan dan gambar, dalam detik
+MOTIF_RESULT_TIMEOUT = int(os.environ.get('MOTIF_RESULT_TIMEOUT', 7 * 24 * 3600))
+
+# Untuk lidi/pustaka dengan kelas baris lebih dari MOTIF_SPARSE_ROWS, mode Greedy, ACO dan
+# Beam hanya memakai MOTIF_SPARSE_K penerus terbaik tiap baris (memori N x K, bukan N x N)
+MOTIF_SPARSE_ROWS = int(os.environ.get('MOTIF_SPARSE_ROWS', 512))
+MOTIF_SPARSE_K = int(os.environ.get('MOTIF_SPARSE_K', 32))
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -0,0 +1,114 @@
+import itertools
+import numpy as np
+from django.test import SimpleTestCase
+from .Function import SkorTotal
+from .Function import SkorMatrix
+from .Function import PackLidi
+from .Function import SkorBlok
+from .Function import KelasBaris
+from .Function import BarisKelas
+from .Function import GreedySearch
+from .Function import DynamicProgramming
+from .Function import SkorUrutan
+
+def LidiAcak(rng, jmlBaris, lebar):
+    # baris lidi biner: 1 putih, 2 hitam
+    return rng.integers(1, 3, size=(jmlBaris, lebar))
+
+class SkorMatrixTest(SimpleTestCase):
+    def assertSkorTotal(self, Skor, kiri, kanan):
+        harapan = np.array([[SkorTotal(a.tolist(), b.tolist()) for b in kanan] for a in kiri])
+        # pembulatan 1 desimal pada nilai .x5 bisa berbeda satu langkah antara float dan numpy
+        selisih = np.abs(Skor - harapan)
+        self.assertTrue((selisih <= 0.1 + 1e-9).all())
+        self.assertLess((selisih > 1e-9).mean(), 0.01)
+
+    def test_sama_dengan_skor_total(self):
+        rng = np.random.default_rng(1)
+        data = LidiAcak(rng, 40, 50)
+
+        self.assertSkorTotal(SkorMatrix(data), data, data)
+
+    def test_lebar_bukan_kelipatan_64(self):
+        rng = np.random.default_rng(5)
+        for lebar in [2, 63, 64, 65, 127, 130]:
+            kiri, kanan = LidiAcak(rng, 12, lebar), LidiAcak(rng, 9, lebar)
+            Skor = SkorBlok(PackLidi(kiri), PackLidi(kanan))
+
+            self.assertEqual(Skor.shape, (12, 9))
+            self.assertSkorTotal(Skor, kiri, kanan)
+
+class KelasBarisTest(SimpleTestCase):
+    def test_baris_awal_tetap_baris_pilihan(self):
+        # baris 0, 1, 5 identik; 2, 4 identik; 3, 6, 7 identik
+        data = np.array([[0], [0], [1], [2], [1], [0], [2], [2]])
+        _, kelas = KelasBaris(data)
+
+        for baris in range(len(data)):
+            urutan = [kelas[baris], kelas[baris], (kelas[baris] + 1) % 3, kelas[baris]]
+            hasil = BarisKelas(urutan, kelas, baris)
+
+            self.assertEqual(hasil[0], baris)
+            np.testing.assert_array_equal(kelas[hasil], urutan)
+            # kelas yang sama berurutan tetap memakai anggota berbeda
+            self.assertNotEqual(hasil[0], hasil[1])
+
+    def test_ekspansi_isi_baris_sama(self):
+        rng = np.random.default_rng(4)
+        data = LidiAcak(rng, 30, 3)
+        wakil, kelas = KelasBaris(data)
+
+        # setiap baris asli sama dengan wakil kelasnya, nomor kelas urut kemunculan pertama
+        np.testing.assert_array_equal(wakil[kelas], data)
+        _, pertama = np.unique(kelas, return_index=True)
+        self.assertTrue((np.diff(pertama) > 0).all())
+
+        urutan = rng.integers(0, len(wakil), size=50)
+        hasil = BarisKelas(urutan, kelas)
+        np.testing.assert_array_equal(data[hasil], wakil[urutan])
+
+class GreedySearchTest(SimpleTestCase):
+    def test_tidak_ada_baris_berulang(self):
+        # diagonal tinggi: restart [Baris, Baris, ...] tidak boleh masuk kandidat
+        rng = np.random.default_rng(0)
+        Skor = rng.random((6, 6))
+        np.fill_diagonal(Skor, 10)
+
+        hasil = GreedySearch(Skor, 2, 5, seed=0, jmlKandidat=4)
+
+        for urutan in hasil.kandidat:
+            urutan = np.asarray(urutan)
+            self.assertEqual(urutan[0], 2)
+            self.assertFalse((urutan[1:] == urutan[:-1]).any())
+
+class DynamicProgrammingTest(SimpleTestCase):
+    def brute(self, Skor, jmlBaris, jmlAnggota=None):
+        # skor terbaik dari semua urutan; baris sama berurutan hanya untuk kelas beranggota > 1
+        ulang = np.zeros(len(Skor), dtype=bool) if jmlAnggota is None else np.asarray(jmlAnggota) > 1
+        terbaik = -np.inf
+        for urutan in itertools.product(range(len(Skor)), repeat=jmlBaris):
+            urutan = np.array(urutan)
+            sama = urutan[1:] == urutan[:-1]
+            if (sama & ~ulang[urutan[1:]]).any():
+                continue
+            terbaik = max(terbaik, SkorUrutan(Skor, urutan))
+        return terbaik
+
+    def test_sama_dengan_brute_force(self):
+        rng = np.random.default_rng(2)
+        for jmlLidi, jmlBaris in [(2, 5), (4, 4), (5, 5)]:
+            Skor = np.round(rng.random((jmlLidi, jmlLidi)) * 10, 1)
+            hasil = DynamicProgramming(Skor, jmlBaris)
+
+            self.assertEqual(len(hasil.urutan), jmlBaris)
+            self.assertAlmostEqual(hasil.skor, self.brute(Skor, jmlBaris))
+
+    def test_kelas_beranggota_boleh_berulang(self):
+        rng = np.random.default_rng(3)
+        Skor = np.round(rng.random((4, 4)) * 10, 1)
+        np.fill_diagonal(Skor, 20)
+        jmlAnggota = np.array([1, 3, 1, 2])
+
+        hasil = DynamicProgramming(Skor, 5, jmlAnggota=jmlAnggota)
+
+        self.assertAlmostEqual(hasil.skor, self.brute(Skor, 5, jmlAnggota))
@@ -36,6 +36,8 @@ urlpatterns = [
     
     # =================== MOTIF GENERATION (EXISTING) ===================
     path('external', views.external),
+    path('external/<str:job_id>', views.motif_result, name="motif_result"),
+    path('external/progress/<str:job_id>', views.get_motif_progress_view, name="motif_progress"),
     path('save', views.save),
     path('PostImage', views.PostImage),
     path('post', views.createpost),
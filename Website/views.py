@@ -10,11 +10,14 @@ from django.contrib.auth.models import User
 from django.contrib.sessions.models import Session
 from itertools import zip_longest
 from .CheckModule import Check
-from .CreateImageModule import CreateImageMotif
+from .CreateImageModule import CleanWorkspace
+from .JobModule import SubmitMotifJob
+from .JobModule import SubmitAsetJob
 from .SaveModule import Save
-from .MotifModule import Motif
-from .zipModule import ZIP
-from .deleteModule import Delete
+from .AssetModule import AsetMotif
+from .AssetModule import ParseUrutan
+from .AssetModule import LengkapiMotif
+from .ImageInfoModule import UkuranGambar
 import sys, os, re
 from django.shortcuts import render
 from .models import UlosCharacteristic, UlosColorThread
@@ -97,6 +100,8 @@ def generator(request):
 @login_required(login_url='login')
 def external(request):
     jmlBaris = request.POST.get('jmlBaris')
+    seed = request.POST.get('seed', '').strip()
+    pustaka = request.POST.get('pustaka') == '1'
     Baris = "1"
     user = request.user
     username = user.username
@@ -141,25 +146,63 @@ def external(request):
     if state == "0":
         return render(request,'failedWidth.html',{'imgWidth':str(imgWidth)})
     else: 
-        if(jmlBaris %2 == 0):
-            jmlBaris = str(jmlBaris)
-            Image = CreateImageMotif(str(fileurl), str(filename), jmlBaris, Baris, "4", username)
-            URLEdit, UrutanLidi = Image.imageEven()
-            URLEdit2, UrutanLidi2 = Image.imageEven()
-            URLEdit3, UrutanLidi3 = Image.imageEven()
-            URLEdit4, UrutanLidi4 = Image.imageEven()
+        CleanWorkspace(username)
 
-        else:
-            jmlBaris = str(jmlBaris)
-            Image = CreateImageMotif(str(fileurl), str(filename), jmlBaris, Baris, "4", username)
-            URLEdit, UrutanLidi = Image.imageOdd()
-            URLEdit2, UrutanLidi2 = Image.imageOdd()
-            URLEdit3, UrutanLidi3 = Image.imageOdd()
-            URLEdit4, UrutanLidi4 = Image.imageOdd()
+        # empat kandidat berbeda dari satu kali search, dikerjakan di process pool
+        # seed kosong berarti seed acak, seed yang sama menghasilkan motif yang sama
+        jmlBaris = str(jmlBaris)
+        try:
+            seed = int(seed)
+        except ValueError:
+            seed = None
+        if seed is not None and seed < 0:
+            seed = None
+        context = {'jmlBaris': jmlBaris, 'raw_url': templateurl}
+        job_id = SubmitMotifJob(str(fileurl), str(filename), jmlBaris, Baris, "4", username, 4, context, seed, pustaka)
+
+        if job_id is None:
+            messages.success(request, "Server sedang sibuk, silahkan coba beberapa saat lagi")
+            return render(request, 'home.html', {"jmlBaris": jmlBaris, "status":status,'navlink1':navlink[0],'navlink2':navlink[1],'navlink3':navlink[2],'navlink4':navlink[3]})
+
+        if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+            return JsonResponse({'job_id': job_id})
+
+        return redirect('motif_result', job_id=job_id)
+
+@login_required(login_url='login')
+def motif_result(request, job_id):
+    job = cache.get(job_id)
+    username = request.user.username
+    navlink = ['nav-link nav-link-1 ','nav-link nav-link-2 active','nav-link nav-link-3','nav-link nav-link-4']
+
+    if job is None or job.get('user') != username:
+        return redirect('generator')
+
+    if job.get('status') == 'Error':
+        messages.success(request, "Motif gagal dibuat, silahkan coba lagi")
+        return redirect('generator')
+
+    if job.get('status') != 'Completed':
+        return render(request, 'generating.html', {'job_id': job_id, 'progress': job.get('progress', 0), 'job_status': job.get('status', '')})
+
+    (URLEdit, UrutanLidi, Seed), (URLEdit2, UrutanLidi2, Seed2), (URLEdit3, UrutanLidi3, Seed3), (URLEdit4, UrutanLidi4, Seed4) = job['hasil']
+
+    jenisGenerate = ['Tabu Search', 'Greedy Serach', 'Random Search', 'ACO', 'Dynamic Programming', 'Beam Search']
+
+    return render(request, 'motif.html',{'user':username,'webp':settings.MOTIF_WEBP,'jmlBaris':job['jmlBaris'], 'raw_url':job['raw_url'], 'edit_url': URLEdit, 'urutan_lidi':UrutanLidi, 'seed':Seed, 'edit_url2': URLEdit2, 'urutan_lidi2':UrutanLidi2, 'seed2':Seed2, 'edit_url3': URLEdit3, 'urutan_lidi3':UrutanLidi3, 'seed3':Seed3, 'edit_url4': URLEdit4, 'urutan_lidi4':UrutanLidi4, 'seed4':Seed4, 'jenis1':jenisGenerate[3], 'jenis2':jenisGenerate[3], 'jenis3':jenisGenerate[3], 'jenis4':jenisGenerate[3],'navlink1':navlink[0],'navlink2':navlink[1],'navlink3':navlink[2],'navlink4':navlink[3]})
+
+@login_required(login_url='login')
+def get_motif_progress_view(request, job_id):
+    job = cache.get(job_id)
+
+    if job is None or job.get('user') != request.user.username:
+        return JsonResponse({'error': 'Job not found or expired.', 'progress': 100, 'status': 'Error'}, status=404)
 
-        jenisGenerate = ['Tabu Search', 'Greedy Serach', 'Random Search', 'ACO']
+    data = {'progress': job.get('progress', 0), 'status': job.get('status', '')}
+    if job.get('status') == 'Error':
+        data['error'] = job.get('error', 'Silahkan coba lagi.')
 
-        return render(request, 'motif.html',{'user':username,'jmlBaris':jmlBaris, 'raw_url':templateurl, 'edit_url': URLEdit, 'urutan_lidi':UrutanLidi, 'edit_url2': URLEdit2, 'urutan_lidi2':UrutanLidi2, 'edit_url3': URLEdit3, 'urutan_lidi3':UrutanLidi3, 'edit_url4': URLEdit4, 'urutan_lidi4':UrutanLidi4, 'jenis1':jenisGenerate[3], 'jenis2':jenisGenerate[3], 'jenis3':jenisGenerate[3], 'jenis4':jenisGenerate[3],'navlink1':navlink[0],'navlink2':navlink[1],'navlink3':navlink[2],'navlink4':navlink[3]})
+    return JsonResponse(data)
 
 @login_required(login_url='login')
 def save(request):
@@ -170,6 +213,8 @@ def save(request):
     jenisGenerate = request.POST.get('JenisGenerate')
     jmlBaris = request.POST.get('jmlBaris')
     user = request.POST.get('user')
+    seed = request.POST.get('seed', '')
+    varian = request.POST.get('varian', '')
     navlink = ['nav-link nav-link-1 ','nav-link nav-link-2 active','nav-link nav-link-3','nav-link nav-link-4']
     path = os.getcwd()
     
@@ -179,7 +224,7 @@ def save(request):
     image2 =  ObjectAsal.SaveMotifAsal()
     image3 =  Objecthasil.SaveMotiHasil()
 
-    return render(request, 'download.html',{'user':user,'jmlBaris':jmlBaris,'raw_url1':image2, 'edit_url1': image3, 'Urutan':str(Urutan), 'jenis': str(jenisGenerate),'navlink1':navlink[0],'navlink2':navlink[1],'navlink3':navlink[2],'navlink4':navlink[3]})
+    return render(request, 'download.html',{'user':user,'jmlBaris':jmlBaris,'raw_url1':image2, 'edit_url1': image3, 'Urutan':str(Urutan), 'jenis': str(jenisGenerate), 'seed': seed, 'varian': varian,'navlink1':navlink[0],'navlink2':navlink[1],'navlink3':navlink[2],'navlink4':navlink[3]})
 
 @login_required(login_url='login')
 def PostImage(request):
@@ -192,7 +237,23 @@ def PostImage(request):
                     post.jenisGenerate = request.POST.get('jenisGenerate')
                     post.jmlBaris = request.POST.get('jmlBaris')
                     post.user = request.POST.get('user')
+                    post.seed = request.POST.get('seed', '')
+                    # seed yang sama menghasilkan 4 varian, varian 1-4 menunjuk kandidat yang disimpan
+                    try:
+                        post.varian = int(request.POST.get('varian', ''))
+                    except ValueError:
+                        post.varian = None
+                    # nilai form rusak atau gambar lidi hilang: motif tetap disimpan,
+                    # metadata diisi LengkapiMotif() saat motif pertama kali dibuka
+                    try:
+                        post.urutan = ParseUrutan(post.urutanLidi)
+                        post.tinggiLidi, post.lebarLidi = UkuranGambar(post.imgBefore[1:])
+                    except (ValueError, OSError):
+                        post.urutan, post.tinggiLidi, post.lebarLidi = [], None, None
                     post.save()
+
+                    # grid, slice dan zip untuk halaman detail dibuat di background
+                    SubmitAsetJob(post.id, post.imgBefore, post.imgAfter)
                     
                     return render(request, 'success.html')  
 
@@ -337,79 +398,29 @@ def motif(request, id):
     if status == 0:
           status=None
 
-    if len(motif.imgAfter)>0:
-        ObjectAsal = Motif(str(motif.imgBefore))
-
-        image =  ObjectAsal.UrutanLidi()
-        
-    ObjecHasil = Motif(str(motif.imgAfter))
-
-    Urutan_Lidi = eval(image)
-    UrutanLidi_even = []
-    UrutanLidi_odd = []
-
-    for i in range(len(Urutan_Lidi)):
-         if i % 2 == 0:
-              UrutanLidi_even.append(Urutan_Lidi[i])
-         else:
-              UrutanLidi_odd.append(Urutan_Lidi[i]) 
-    
-    image = image[1:-1]
-
-    Lidi =  ObjectAsal.GridLidi()
-    Hasil =  ObjecHasil.GridMotif()
-
-    ObjectRed = Motif(Hasil)
-    RedLine =  ObjectRed.redLine()
-
-    ObjectZIP = ZIP(str(motif.imgAfter), str(motif.imgBefore))
-    Zipfile =  ObjectZIP.ZIPFile()
+    # hanya membaca metadata tersimpan, motif lama dilengkapi sekali
+    if motif.tinggiLidi is None or motif.aset is None:
+        LengkapiMotif(motif)
 
-    Help = ObjectAsal.GridHelp()
+    Aset = motif.aset
+    Lidi = Aset["lidi"]
+    RedLine = Aset["red"]
+    Zipfile = Aset["zip"]
+    Help = Aset["help"]
+    SpriteLidi = Aset["spriteLidi"]
+    SpriteMotif = Aset["spriteMotif"]
 
-    ObjecSlice = Motif(Lidi)
-    Slice =  ObjecSlice.Slice()
+    Urutan_Lidi = list(range(1, motif.tinggiLidi + 1))
+    image = ", ".join(str(i) for i in Urutan_Lidi)
+    UrutanMotif = motif.urutan
 
-    Slice = eval(Slice)
+    # baris genap dan ganjil ditampilkan berdampingan
+    Slice = SpriteLidi["baris"]
+    Slice2 = SpriteMotif["baris"]
+    myList = zip_longest(Slice[::2], Urutan_Lidi[::2], Slice[1::2], Urutan_Lidi[1::2])
+    myList2 = zip_longest(Slice2[::2], UrutanMotif[::2], Slice2[1::2], UrutanMotif[1::2])
 
-    Slice_even = []
-    Slice_odd = []     
-    for i in range(len(Slice)):
-         if i%2 == 0:
-              Slice_even.append(Slice[i])
-         else:
-              Slice_odd.append(Slice[i])
-    
-    ObjecSlice2 = Motif(RedLine)
-    Slice2 =  ObjecSlice2.Slice()
-
-    Slice2 = eval(Slice2)
-
-    Slice2_even = []
-    Slice2_odd = []
-
-    for i in range(len(Slice2)):
-         if i % 2 == 0:
-              Slice2_even.append(Slice2[i])
-         else:
-              Slice2_odd.append(Slice2[i]) 
-       
-    UrutanMotif = f"[{motif.urutanLidi}]"
-    UrutanMotif = eval(UrutanMotif)
-
-    UrutanMotif_even = []
-    UrutanMotif_odd = []
-
-    for i in range(len(UrutanMotif)):
-         if i % 2 == 0:
-              UrutanMotif_even.append(UrutanMotif[i])
-         else:
-              UrutanMotif_odd.append(UrutanMotif[i]) 
-    
-    myList = zip_longest(Slice_even, UrutanLidi_even, Slice_odd, UrutanLidi_odd)
-    myList2 = zip_longest(Slice2_even, UrutanMotif_even, Slice2_odd, UrutanMotif_odd)
-
-    return render (request, 'lihatMotif.html', {'zip': Zipfile,'GridHelp': Help,'SliceMotif': myList2,'SliceLidi': myList,'UrutanLidi': Urutan_Lidi,'RedLine': RedLine,'Lidi': Lidi,'urutanAsliLidi': image,'motif': motif, "status":status, 'status1':status1,'navlink1':navlink[0],'navlink2':navlink[1],'navlink3':navlink[2],'navlink4':navlink[3]})
+    return render (request, 'lihatMotif.html', {'zip': Zipfile,'GridHelp': Help,'SliceMotif': myList2,'SliceLidi': myList,'SpriteMotif': SpriteMotif,'SpriteLidi': SpriteLidi,'UrutanLidi': Urutan_Lidi,'RedLine': RedLine,'Lidi': Lidi,'urutanAsliLidi': image,'motif': motif, "status":status, 'status1':status1,'navlink1':navlink[0],'navlink2':navlink[1],'navlink3':navlink[2],'navlink4':navlink[3]})
 
 @login_required(login_url='login')
 def deleteMotif(request):
@@ -417,12 +428,8 @@ def deleteMotif(request):
     id = request.POST.get('DeleteImage')
     prod = MotifForm1.objects.get(id = id)
     if len(prod.imgAfter)>0:
-        ObjecDelete1 = Delete(str(prod.imgAfter))
-        ObjecDelete2 = Delete(str(prod.imgBefore))
+        AsetMotif(str(prod.imgBefore), str(prod.imgAfter)).hapus()
 
-        Image1 =  ObjecDelete1.DeleteMotif()
-        Image2 =  ObjecDelete2.DeleteMotif()
-        
         messages.success(request, "Motif berhasil dihapus")
     prod.delete()
     
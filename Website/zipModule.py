@@ -1,4 +1,5 @@
 import zipfile, sys, os
+from .FileModule import TulisAtomik
 
 class ZIP:
     def __init__(self, pathAfter, pathBefore):
@@ -18,17 +19,15 @@ class ZIP:
         else:
             files_to_zip = [f"{image_fullpath[:-4]}_grid.png", f"{image_fullpath[:-4]}_grid_red.jpg", f"{image_fullpath}", f"{image_fullpath2[:-4]}_grid.jpg", f"{image_fullpath2}"]
 
-            output = zip_filename
-            
-
-
-            # create a ZipFile object in write mode
-            with zipfile.ZipFile(output, 'w') as zip_file:
-            # Loop through each input file path
-                for file_path in files_to_zip:
-                    file_name = os.path.basename(file_path)
-                    # Write the file to the zip file, with the desired path
-                    zip_file.write(file_path, arcname=file_name)
+            # ditulis ke file sementara lalu di-rename agar zip setengah jadi tidak pernah terkirim
+            with TulisAtomik(zip_filename) as output:
 
+                # create a ZipFile object in write mode
+                with zipfile.ZipFile(output, 'w') as zip_file:
+                # Loop through each input file path
+                    for file_path in files_to_zip:
+                        file_name = os.path.basename(file_path)
+                        # Write the file to the zip file, with the desired path
+                        zip_file.write(file_path, arcname=file_name)
             
             return f"{zip_filename}"
\ No newline at end of file